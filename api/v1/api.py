@@ -2,7 +2,7 @@ from fastapi import APIRouter
 
 
 from api.v1.endpoints import test, terms, register, login, logout, dronespot, refresh, review, course, follow, profile, \
-    userInfo
+    userInfo, status
 
 # api_router = APIRouter()
 # api_router.include_router(test.router, prefix="/test", tags=["test"])
@@ -18,4 +18,5 @@ router.include_router(review.router)
 router.include_router(course.router)
 router.include_router(follow.router)
 router.include_router(profile.router)
-router.include_router(userInfo.router)
\ No newline at end of file
+router.include_router(userInfo.router)
+router.include_router(status.router)
\ No newline at end of file
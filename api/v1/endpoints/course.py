@@ -1,7 +1,8 @@
 from typing import (
     Dict,
     Any,
-    List
+    List,
+    Optional
 )
 
 from fastapi import (
@@ -9,21 +10,24 @@ from fastapi import (
     Depends,
     HTTPException,
     status,
-    Response
+    Response,
+    Query
 )
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select
 
 from models import (
     Course,
     Place,
     CourseVisit,
     Dronespot,
-    Review,
     UserDronespotLike
 )
 from core.auth import verify_user_token
-from database.mariadb_session import get_db
+from core.pagination import paginate, set_next_cursor
+from core.sampler import sampler, COURSE
+from database.mariadb_session import get_async_db, get_async_read_db
 from schemas import (
     CourseCreate,
     Course as CourseSchema,
@@ -47,18 +51,19 @@ def check_admin(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def get_course_with_places(
+async def get_course_with_places(
         course_id: int,
-        db: Session,
-        uid=None
+        db: AsyncSession,
+        uid=None,
+        user_db: Optional[AsyncSession] = None
 ):
-    course_data = db.query(Course).filter(Course.id == course_id).one()
-    visit_data = db.execute(select(CourseVisit).where(CourseVisit.course_id == course_id)).all()
+    course_data = (await db.execute(select(Course).where(Course.id == course_id))).scalar_one()
+    visit_data = (await db.execute(select(CourseVisit).where(CourseVisit.course_id == course_id))).all()
     places = []
     for v in visit_data:
         v = v[0]
         if v.dronespot_id is None:
-            place_data = db.query(Place).filter(Place.id == v.place_id).one()
+            place_data = (await db.execute(select(Place).where(Place.id == v.place_id))).scalar_one()
             place_data.area = []
             places.append(PlaceSchema(
                 id=place_data.id,
@@ -73,14 +78,15 @@ def get_course_with_places(
                 place_type_id=place_data.place_type_id
             ))
         else:
-            place_data = db.query(Dronespot).filter(Dronespot.id == v.dronespot_id).one()
+            place_data = (await db.execute(select(Dronespot).where(Dronespot.id == v.dronespot_id))).scalar_one()
 
             is_like = 0
             if uid is not None:
-                like_exist = db.query(UserDronespotLike).filter(
+                # 본인 좋아요는 레플리카 지연 없이 보이도록 user_db(primary) 에서
+                like_exist = await (user_db or db).scalar(select(UserDronespotLike).where(
                     UserDronespotLike.user_uid == uid,
                     UserDronespotLike.drone_spot_id == v.dronespot_id
-                ).first()
+                ))
                 if like_exist: is_like = 1
 
             places.append(DronespotSchema(
@@ -98,12 +104,8 @@ def get_course_with_places(
                     camera=place_data.permit_camera
                 ),
                 is_like=0 if uid is None else is_like,
-                likes_count=db.query(func.count(UserDronespotLike.drone_spot_id)).filter(
-                    UserDronespotLike.drone_spot_id == place_data.id
-                ).scalar(),
-                reviews_count=db.query(func.count(Review.id)).filter(
-                    Review.dronespot_id == place_data.id
-                ).scalar(),
+                likes_count=place_data.likes_count,
+                reviews_count=place_data.reviews_count,
                 area=[]
             ))
     course_data.places = places
@@ -114,7 +116,7 @@ def get_course_with_places(
 async def create_curse(
         course_data: CourseCreate,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     check_admin(user_data)
 
@@ -125,8 +127,9 @@ async def create_curse(
         duration=0
     )
     db.add(course_model)
-    db.commit()
-    db.refresh(course_model)
+    await db.commit()
+    await db.refresh(course_model)
+    sampler.add(COURSE, course_model.id)
 
     return course_model
 
@@ -135,13 +138,13 @@ async def create_curse(
 async def delete_curse(
         course_id: int,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     check_admin(user_data)
 
-    course_exists = db.query(Course).filter(
+    course_exists = await db.scalar(select(Course).where(
         Course.id == course_id,
-    ).first()
+    ))
 
     if not course_exists:
         raise HTTPException(
@@ -149,8 +152,9 @@ async def delete_curse(
             detail="This course data does not exist",
         )
 
-    db.delete(course_exists)
-    db.commit()
+    await db.delete(course_exists)
+    await db.commit()
+    sampler.remove(COURSE, course_id)
 
     return Response(
         status_code=status.HTTP_204_NO_CONTENT,
@@ -161,22 +165,22 @@ async def add_place(
         course_id: int,
         place_id: int,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     check_admin(user_data)
 
-    course_data = db.query(Course).filter(
+    course_data = await db.scalar(select(Course).where(
         Course.id == course_id
-    ).first()
+    ))
     if not course_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="코스 데이터를 찾을 수 없습니다."
         )
 
-    place_data = db.query(Place).filter(
+    place_data = await db.scalar(select(Place).where(
         Place.id == place_id
-    ).first()
+    ))
     if not place_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -188,32 +192,32 @@ async def add_place(
         place_id=place_data.id
     )
     db.add(course_visit)
-    db.commit()
-    db.refresh(course_visit)
+    await db.commit()
+    await db.refresh(course_visit)
 
-    return get_course_with_places(course_id, db)
+    return await get_course_with_places(course_id, db)
 
 @router.post('/course/{course_id}/dronespot/{dronespot_id}', response_model=CourseWithPlaces, status_code=status.HTTP_200_OK)
 async def add_dronespot(
         course_id: int,
         dronespot_id: int,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     check_admin(user_data)
 
-    course_data = db.query(Course).filter(
+    course_data = await db.scalar(select(Course).where(
         Course.id == course_id
-    ).first()
+    ))
     if not course_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="코스 데이터를 찾을 수 없습니다."
         )
 
-    dronespot_data = db.query(Dronespot).filter(
+    dronespot_data = await db.scalar(select(Dronespot).where(
         Dronespot.id == dronespot_id
-    ).first()
+    ))
     if not dronespot_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -225,96 +229,104 @@ async def add_dronespot(
         dronespot_id=dronespot_data.id
     )
     db.add(course_visit)
-    db.commit()
-    db.refresh(course_visit)
+    await db.commit()
+    await db.refresh(course_visit)
 
-    return get_course_with_places(course_id, db)
+    return await get_course_with_places(course_id, db)
 
 @router.delete('/course/{course_id}/place/{idx}', response_model=CourseWithPlaces, status_code=status.HTTP_200_OK)
 async def delete_dronespot(
         course_id: int,
         idx: int,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     check_admin(user_data)
 
-    course_data = db.query(Course).filter(
+    course_data = await db.scalar(select(Course).where(
         Course.id == course_id
-    ).first()
+    ))
     if not course_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="코스 데이터를 찾을 수 없습니다."
         )
 
-    visit_data = db.execute(select(CourseVisit).where(CourseVisit.course_id == course_id)).all()
+    visit_data = (await db.execute(select(CourseVisit).where(CourseVisit.course_id == course_id))).all()
     if len(visit_data) - 1 < idx:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"{idx} 번째 장소는 존재하지 않습니다."
         )
-    db.delete(visit_data[idx][0])
-    db.commit()
+    await db.delete(visit_data[idx][0])
+    await db.commit()
 
-    return get_course_with_places(course_id, db)
+    return await get_course_with_places(course_id, db)
 
 @router.get('/course/{course_id}', response_model=CourseWithPlaces, status_code=status.HTTP_200_OK)
 async def get_course(
         course_id: int,
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_read_db)
 ):
-    course_data = db.query(Course).filter(
+    course_data = await db.scalar(select(Course).where(
         Course.id == course_id
-    ).first()
+    ))
     if not course_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="코스 데이터를 찾을 수 없습니다."
         )
 
-    return get_course_with_places(course_id, db)
+    return await get_course_with_places(course_id, db)
 
 @router.get('/course/dronespot/{dronespot_id}', response_model=List[CourseWithPlaces], status_code=status.HTTP_200_OK)
 async def get_courses_include_dronespot(
         dronespot_id: int,
+        response: Response,
         size: int = 5,
         page: int = 1,
+        cursor: Optional[str] = Query(None),
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_read_db),
+        primary_db: AsyncSession = Depends(get_async_db)
 ):
-    dronespot_data = db.query(Dronespot).filter(
+    dronespot_data = await db.scalar(select(Dronespot).where(
         Dronespot.id == dronespot_id
-    ).first()
+    ))
     if not dronespot_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="드론스팟 데이터를 찾을 수 없습니다."
         )
 
-    visit_data = db.query(CourseVisit).filter(
+    visit_data = (await db.scalars(paginate(select(CourseVisit).where(
         CourseVisit.dronespot_id == dronespot_id
     ).group_by(
         CourseVisit.course_id,
         CourseVisit.dronespot_id
-    ).offset((page - 1) * size).limit(size).all()
+    ), [(CourseVisit.course_id, False)], cursor, page, size))).all()
 
     user_uid = None
     if user_data is not None:
         user_uid = user_data['sub']
     response_data = []
     for data in visit_data:
-        response_data.append(get_course_with_places(
-            data.course_id, db, uid=user_uid
+        response_data.append(await get_course_with_places(
+            data.course_id, db, uid=user_uid, user_db=primary_db
         ))
 
+    set_next_cursor(response, visit_data, size, lambda visit: [visit.course_id])
     return response_data
 
 @router.get('/trend/course', status_code=status.HTTP_200_OK, response_model=CourseDronespot)
 async def get_trend_course(
-        db: Session = Depends(get_db)
+        seed: Optional[int] = Query(None),
+        db: AsyncSession = Depends(get_async_read_db)
 ):
-    random_course = db.query(Course).order_by(func.random()).first()
+    course_ids = sampler.sample(COURSE, 1, seed=seed)
+    random_course = await db.scalar(select(Course).options(
+        selectinload(Course.course_visits).selectinload(CourseVisit.dronespot)
+    ).where(Course.id.in_(course_ids)))
     if random_course is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,30 +1,45 @@
 import asyncio
 import os
 import uuid
+import zlib
+from datetime import date
 from math import radians
 import random
 from typing import Optional, Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from shapely import Point
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Response
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from starlette.staticfiles import StaticFiles
 
+from core.area import save_dronespot_areas, get_dronespot_areas
+from core.autocomplete import autocomplete
 from core.coordinate import CoordinateConverter
-from core.getplace import save_place
+from core.enrichment import enqueue_enrichment, get_latest_enrichment
 from core.getwhether import get_whether_data
+from core.pagination import paginate, set_next_cursor
+from core.recommend import recommender
+from core.sampler import sampler, place_key, DRONESPOT
+from core.name_index import name_index
+from core.spatial_index import spatial_index, bounding_box
+from core.trend import trend_counter, trending_snapshot
 from models import UserDronespotLike as UserDronespotLikeModel, Dronespot as DronespotModel, User as UserModel, TrendDronespot, \
-    Review as ReviewModel, Course as CourseModel, Place as PlaceModel, UserReviewLike, DronePlace as DronePlaceModel, \
+    Review as ReviewModel, Course as CourseModel, Place as PlaceModel, UserReviewLike, \
     CourseVisit as CourseVisitModel
-from schemas import Dronespot, Permit, Area, Location, DronespotResponse
+from schemas import Dronespot, Permit, Area, Location, DronespotResponse, DronespotAutocomplete, EnrichmentJob
 from core.auth import verify_user_token
-from database.mariadb_session import get_db
+from crud.crud_dronespot import get_dronespot_aggregates, increase_dronespot_likes_count
+from database.mariadb_session import get_async_db, get_async_read_db
 from starlette.responses import JSONResponse
 
 from core.config import settings
 
 router = APIRouter()
 
+# 추천 목록의 무작위 순서 seed
+# 같은 seed 의 순서는 드론스팟이 추가/삭제되면 그 수만큼만 밀린다 (sampler.permuted)
+SEED_HEADER = "X-Seed"
+
 @router.post("/dronespot", response_model=Dronespot, status_code=201)
 async def create_dronespot(
         name: str = Form(...),
@@ -36,7 +51,7 @@ async def create_dronespot(
         permit_camera: int = Form(...),
         drone_type: int = Form(...),
         file: Optional[UploadFile] = File(None),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user_data: Dict[str, Any] = Depends(verify_user_token)
 ):
     if not user_data.get("level"):
@@ -58,8 +73,15 @@ async def create_dronespot(
     )
 
     db.add(db_dronespot)
-    db.commit()
-    db.refresh(db_dronespot)
+    await db.commit()
+    await db.refresh(db_dronespot)
+    spatial_index.add(db_dronespot.id, db_dronespot.lat, db_dronespot.lon)
+    name_index.add(db_dronespot.id, db_dronespot.name)
+    autocomplete.add(db_dronespot.id, db_dronespot.name)
+    sampler.add(DRONESPOT, db_dronespot.id)
+
+    area_data = await save_dronespot_areas(db, db_dronespot)
+    await db.commit()
 
     photo_url = None
     if file:
@@ -71,20 +93,15 @@ async def create_dronespot(
         photo_url = f"/media/{new_filename}"
 
         db_dronespot.photo_url = photo_url
-        db.commit()
-        db.refresh(db_dronespot)
+        await db.commit()
+        await db.refresh(db_dronespot)
 
     likes_count = 0
     reviews_count = 0
     is_like = 0
-    area_data = [
-        {"id": 1, "name": "Area 1"},
-        {"id": 2, "name": "Area 2"}
-    ]
 
-    # 주변장소 디비에 저장
-    dronespotID = db_dronespot.id
-    await save_place(dronespotID)
+    # 주변장소 저장은 작업 큐에 넣고 바로 응답 (상태는 /dronespot/{id}/enrichment)
+    await enqueue_enrichment(db, db_dronespot.id)
 
     return {
         "id": db_dronespot.id,
@@ -119,7 +136,7 @@ async def update_dronespot(
         permit_camera: Optional[int] = Form(None),
         drone_type: int = Form(...),
         file: Optional[UploadFile] = File(None),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user_data: Dict[str, Any] = Depends(verify_user_token)
 ):
     if not user_data.get("level"):
@@ -129,7 +146,7 @@ async def update_dronespot(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    db_dronespot = db.query(DronespotModel).filter(DronespotModel.id == dronespot_id).first()
+    db_dronespot = await db.scalar(select(DronespotModel).where(DronespotModel.id == dronespot_id))
     if not db_dronespot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -147,6 +164,9 @@ async def update_dronespot(
         "drone_type": drone_type
     }
 
+    # DOUBLE 컬럼은 Decimal 로 읽히므로 float 로 비교
+    moved = (lat is not None and lat != float(db_dronespot.lat)) or (lon is not None and lon != float(db_dronespot.lon))
+
     for key, value in update_data.items():
         if value is not None:
             setattr(db_dronespot, key, value)
@@ -159,23 +179,27 @@ async def update_dronespot(
             f.write(await file.read())
         db_dronespot.photo_url = f"/media/{new_filename}"
 
-    db.commit()
-    db.refresh(db_dronespot)
+    area_data = await save_dronespot_areas(db, db_dronespot)
 
-    is_like = (
-        db.query(UserDronespotLikeModel)
-        .filter(
+    await db.commit()
+    await db.refresh(db_dronespot)
+    spatial_index.add(db_dronespot.id, db_dronespot.lat, db_dronespot.lon)
+    name_index.add(db_dronespot.id, db_dronespot.name)
+    autocomplete.add(db_dronespot.id, db_dronespot.name)
+
+    # 위치가 바뀌면 주변장소를 다시 받아온다
+    if moved:
+        await enqueue_enrichment(db, db_dronespot.id)
+
+    is_like = await db.scalar(
+        select(func.count())
+        .select_from(UserDronespotLikeModel)
+        .where(
             UserDronespotLikeModel.user_uid == user_data["sub"],
             UserDronespotLikeModel.drone_spot_id == dronespot_id
         )
-        .count()
     )
 
-    likes_count = db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-        UserDronespotLikeModel.drone_spot_id == dronespot_id).scalar()
-    reviews_count = db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot_id).scalar()
-
     return Dronespot(
         id=db_dronespot.id,
         name=db_dronespot.name,
@@ -185,11 +209,11 @@ async def update_dronespot(
             lon=db_dronespot.lon,
             address=db_dronespot.address
         ),
-        likes_count=likes_count,
-        reviews_count=reviews_count,
+        likes_count=db_dronespot.likes_count,
+        reviews_count=db_dronespot.reviews_count,
         photo=db_dronespot.photo_url,
         comment=db_dronespot.comment,
-        area=[Area(id=1, name="Area 1"), Area(id=2, name="Area 2")],
+        area=[Area(**area) for area in area_data],
         permit=Permit(
             flight=db_dronespot.permit_flight,
             camera=db_dronespot.permit_camera
@@ -198,10 +222,31 @@ async def update_dronespot(
     )
 
 
+@router.get("/dronespot/{dronespot_id}/enrichment", response_model=EnrichmentJob)
+async def get_dronespot_enrichment(
+        dronespot_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        user_data: Dict[str, Any] = Depends(verify_user_token)
+):
+    if not user_data.get("level"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    job = await get_latest_enrichment(db, dronespot_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Enrichment job not found"
+        )
+    return job
+
 @router.delete("/dronespot/{drone_spot_id}", status_code=204)
 async def delete_dronespot(
         drone_spot_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user_data: Dict[str, Any] = Depends(verify_user_token)
 ):
     if not user_data.get("level"):
@@ -211,44 +256,48 @@ async def delete_dronespot(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    db_dronespot = db.query(DronespotModel).filter(DronespotModel.id == drone_spot_id).first()
+    db_dronespot = await db.scalar(select(DronespotModel).where(DronespotModel.id == drone_spot_id))
     if not db_dronespot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Dronespot not found"
         )
 
-    db.delete(db_dronespot)
-    db.commit()
+    await db.delete(db_dronespot)
+    await db.commit()
+    spatial_index.remove(drone_spot_id)
+    name_index.remove(drone_spot_id)
+    autocomplete.remove(drone_spot_id)
+    sampler.remove(DRONESPOT, drone_spot_id)
 
     return JSONResponse(content={"message": "Delete successfully"})
 
 @router.post("/like/dronespot/{dronespot_id}", status_code=204)
 async def like_dronespot(
         dronespot_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user_data: Dict[str, Any] = Depends(verify_user_token)
 ):
     user_uid = user_data.get("sub")
 
-    user = db.query(UserModel).filter(UserModel.uid == user_uid).first()
+    user = await db.scalar(select(UserModel).where(UserModel.uid == user_uid))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    dronespot = db.query(DronespotModel).filter(DronespotModel.id == dronespot_id).first()
+    dronespot = await db.scalar(select(DronespotModel).where(DronespotModel.id == dronespot_id))
     if not dronespot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Dronespot not found"
         )
 
-    like_exists = db.query(UserDronespotLikeModel).filter(
+    like_exists = await db.scalar(select(UserDronespotLikeModel).where(
         UserDronespotLikeModel.user_uid == user_uid,
         UserDronespotLikeModel.drone_spot_id == dronespot_id
-    ).first()
+    ))
     if like_exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -260,54 +309,58 @@ async def like_dronespot(
         drone_spot_id=dronespot_id
     )
     db.add(new_like)
-    db.commit()
+    await increase_dronespot_likes_count(db, dronespot_id, 1)
+    await db.commit()
 
     return JSONResponse(content={"message": "Liked successfully"})
 
 @router.delete("/like/dronespot/{dronespot_id}", status_code=204)
 async def unlike_dronespot(
         dronespot_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user_data: Dict[str, Any] = Depends(verify_user_token)
 ):
     user_uid = user_data.get("sub")
     print(user_uid)
 
-    user = db.query(UserModel).filter(UserModel.uid == user_uid).first()
+    user = await db.scalar(select(UserModel).where(UserModel.uid == user_uid))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    dronespot = db.query(DronespotModel).filter(DronespotModel.id == dronespot_id).first()
+    dronespot = await db.scalar(select(DronespotModel).where(DronespotModel.id == dronespot_id))
     if not dronespot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Dronespot not found"
         )
 
-    like_exists = db.query(UserDronespotLikeModel).filter(
+    like_exists = await db.scalar(select(UserDronespotLikeModel).where(
         UserDronespotLikeModel.user_uid == user_uid,
         UserDronespotLikeModel.drone_spot_id == dronespot_id
-    ).first()
+    ))
     if not like_exists:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User has not liked this dronespot"
         )
 
-    db.delete(like_exists)
-    db.commit()
+    await db.delete(like_exists)
+    await increase_dronespot_likes_count(db, dronespot_id, -1)
+    await db.commit()
 
     return JSONResponse(content={"message": "UnLiked successfully"})
 
 @router.get("/dronespot/like/{user_uid}", response_model=List[Dronespot])
 async def get_liked_dronespots(
         user_uid: str,
+        response: Response,
         page_num: int = Query(1, alias="page_num"),
         size: int = Query(10, alias="size"),
-        db: Session = Depends(get_db),
+        cursor: Optional[str] = Query(None),
+        db: AsyncSession = Depends(get_async_db),
         user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
@@ -317,13 +370,15 @@ async def get_liked_dronespots(
             detail="Forbidden"
         )
 
-    liked_dronespots = (
-        db.query(DronespotModel)
+    # 본인이 방금 누른 좋아요가 바로 보이도록 primary 에서 조회
+    liked_rows = (await db.execute(paginate(
+        select(DronespotModel, UserDronespotLikeModel.created_at)
         .join(UserDronespotLikeModel, DronespotModel.id == UserDronespotLikeModel.drone_spot_id)
-        .filter(UserDronespotLikeModel.user_uid == user_uid)
-        .order_by(UserDronespotLikeModel.created_at.desc())
-        .offset((page_num - 1) * size).limit(size).all()
-    )
+        .where(UserDronespotLikeModel.user_uid == user_uid),
+        [(UserDronespotLikeModel.created_at, True), (UserDronespotLikeModel.drone_spot_id, True)],
+        cursor, page_num, size
+    ))).all()
+    liked_dronespots = [row[0] for row in liked_rows]
 
     if not liked_dronespots:
         raise HTTPException(
@@ -331,6 +386,9 @@ async def get_liked_dronespots(
             detail="No liked dronespots found"
         )
 
+    aggregates = await get_dronespot_aggregates(db, [dronespot.id for dronespot in liked_dronespots])
+    areas = await get_dronespot_areas(db, [dronespot.id for dronespot in liked_dronespots])
+
     response_data = []
     for dronespot in liked_dronespots:
         dronespot_data = {
@@ -342,18 +400,11 @@ async def get_liked_dronespots(
                 "lon": dronespot.lon,
                 "address": dronespot.address
             },
-            "likes_count": db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).scalar(),
-            "reviews_count": db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot.id
-            ).scalar(),
+            "likes_count": aggregates[dronespot.id]["likes_count"],
+            "reviews_count": aggregates[dronespot.id]["reviews_count"],
             "photo": dronespot.photo_url,
             "comment": dronespot.comment,
-            "area": [
-                {"id": 1, "name": "Area 1"},
-                {"id": 2, "name": "Area 2"}
-            ],
+            "area": areas[dronespot.id],
             "permit": {
                 "flight": dronespot.permit_flight,
                 "camera": dronespot.permit_camera
@@ -361,25 +412,26 @@ async def get_liked_dronespots(
         }
         response_data.append(dronespot_data)
 
+    set_next_cursor(response, liked_rows, size, lambda row: [row.created_at, row[0].id])
     return response_data
 
 @router.get("/dronespot/popular", response_model=List[Dronespot])
 async def get_popular_dronespots(
+        response: Response,
         page_num: int = Query(1, ge=1),
         size: int = Query(10, ge=1),
-        db: Session = Depends(get_db),
+        cursor: Optional[str] = Query(None),
+        db: AsyncSession = Depends(get_async_read_db),
+        primary_db: AsyncSession = Depends(get_async_db),
         user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
-    dronespots_query = db.query(
-        DronespotModel,
-        func.count(UserDronespotLikeModel.user_uid).label('likes_count')
-    ).outerjoin(UserDronespotLikeModel, DronespotModel.id == UserDronespotLikeModel.drone_spot_id) \
-     .group_by(DronespotModel.id) \
-     .order_by(func.count(UserDronespotLikeModel.user_uid).desc()) \
-     .offset((page_num - 1) * size) \
-     .limit(size)
+    dronespots_query = paginate(
+        select(DronespotModel),
+        [(DronespotModel.likes_count, True), (DronespotModel.id, False)],
+        cursor, page_num, size
+    )
 
-    dronespots = dronespots_query.all()
+    dronespots = (await db.scalars(dronespots_query)).all()
 
     if not dronespots:
         raise HTTPException(
@@ -388,54 +440,59 @@ async def get_popular_dronespots(
         )
 
     user_uid = user_data.get("sub") if user_data else None
+    aggregates = await get_dronespot_aggregates(db, [dronespot.id for dronespot in dronespots], user_uid, primary_db)
+    areas = await get_dronespot_areas(db, [dronespot.id for dronespot in dronespots])
 
     response_data = [
         {
             "id": dronespot.id,
             "name": dronespot.name,
-            "is_like": 1 if user_uid and db.query(UserDronespotLikeModel).filter(
-                UserDronespotLikeModel.user_uid == user_uid,
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).first() else 0,
+            "is_like": aggregates[dronespot.id]["is_like"],
             "location": {
                 "lat": dronespot.lat,
                 "lon": dronespot.lon,
                 "address": dronespot.address
             },
-            "likes_count": likes_count,
-            "reviews_count": db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot.id
-            ).scalar(),
+            "likes_count": aggregates[dronespot.id]["likes_count"],
+            "reviews_count": aggregates[dronespot.id]["reviews_count"],
             "photo": dronespot.photo_url,
             "comment": dronespot.comment,
-            "area": [
-                {"id": 1, "name": "Area 1"},
-                {"id": 2, "name": "Area 2"}
-            ],
+            "area": areas[dronespot.id],
             "permit": {
                 "flight": dronespot.permit_flight,
                 "camera": dronespot.permit_camera
             }
         }
-        for dronespot, likes_count in dronespots
+        for dronespot in dronespots
     ]
 
+    set_next_cursor(response, dronespots, size, lambda dronespot: [dronespot.likes_count, dronespot.id])
     return response_data
 
 @router.get("/dronespot/keyword/popular", response_model=List[Dronespot])
 async def get_popular_dronespots_by_keyword(
     page_num: int = Query(1, ge=1),
     size: int = Query(10, ge=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
-    dronespots_query = (
-        db.query(DronespotModel)
-        .join(TrendDronespot, DronespotModel.id == TrendDronespot.dronespot_id)
-        .order_by(TrendDronespot.count.desc()).offset((page_num - 1) * size).limit(size)
-    )
-
-    dronespots = dronespots_query.all()
+    if trending_snapshot.ready:
+        # 스케줄러가 계산해 둔 감쇠 점수 순위에서 이번 페이지의 id 만 조회
+        trending_ids = trending_snapshot.page((page_num - 1) * size, page_num * size)
+        dronespots_by_id = {
+            dronespot.id: dronespot
+            for dronespot in (await db.scalars(select(DronespotModel).where(DronespotModel.id.in_(trending_ids)))).all()
+        }
+        dronespots = [dronespots_by_id[dronespot_id] for dronespot_id in trending_ids if dronespot_id in dronespots_by_id]
+    else:
+        # 첫 스냅샷이 만들어지기 전에는 누적 카운트 순
+        dronespots_query = (
+            select(DronespotModel)
+            .join(TrendDronespot, DronespotModel.id == TrendDronespot.dronespot_id)
+            .order_by(TrendDronespot.count.desc()).offset((page_num - 1) * size).limit(size)
+        )
+        dronespots = (await db.scalars(dronespots_query)).all()
 
     if not dronespots:
         raise HTTPException(
@@ -444,32 +501,24 @@ async def get_popular_dronespots_by_keyword(
         )
 
     user_uid = user_data.get("sub") if user_data else None
+    aggregates = await get_dronespot_aggregates(db, [dronespot.id for dronespot in dronespots], user_uid, primary_db)
+    areas = await get_dronespot_areas(db, [dronespot.id for dronespot in dronespots])
 
     response_data = [
         {
             "id": dronespot.id,
             "name": dronespot.name,
-            "is_like": 1 if user_uid and db.query(UserDronespotLikeModel).filter(
-                UserDronespotLikeModel.user_uid == user_uid,
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).first() else 0,
+            "is_like": aggregates[dronespot.id]["is_like"],
             "location": {
                 "lat": dronespot.lat,
                 "lon": dronespot.lon,
                 "address": dronespot.address
             },
-            "likes_count": db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).scalar(),
-            "reviews_count": db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot.id
-            ).scalar(),
+            "likes_count": aggregates[dronespot.id]["likes_count"],
+            "reviews_count": aggregates[dronespot.id]["reviews_count"],
             "photo": dronespot.photo_url,
             "comment": dronespot.comment,
-            "area": [
-                {"id": 1, "name": "Area 1"},
-                {"id": 2, "name": "Area 2"}
-            ],
+            "area": areas[dronespot.id],
             "permit": {
                 "flight": dronespot.permit_flight,
                 "camera": dronespot.permit_camera
@@ -480,6 +529,17 @@ async def get_popular_dronespots_by_keyword(
 
     return response_data
 
+@router.get("/dronespot/autocomplete", response_model=List[DronespotAutocomplete])
+async def autocomplete_dronespots(
+    keyword: str = Query(..., min_length=1),
+    size: int = Query(10, ge=1, le=settings.AUTOCOMPLETE_MAX_SIZE)
+):
+    # 입력 중인 키워드(음절, 자모, 초성)로 이름 접두사 검색 - DB 조회나 트렌드 집계 없이 메모리에서만
+    return [
+        {"id": dronespot_id, "name": name}
+        for dronespot_id, name in autocomplete.search(keyword, size)
+    ]
+
 @router.get("/dronespot/search", response_model=List[Dronespot])
 async def search_dronespots(
     lat: Optional[float] = Query(None),
@@ -489,7 +549,9 @@ async def search_dronespots(
     drone_type: Optional[int] = Query(None),
     page_num: int = Query(1, ge=1),
     size: int = Query(10, ge=1),
-    db: Session = Depends(get_db),
+    order: int = Query(0, alias="order"),  # 0: 이름순, 1: 거리순
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
@@ -499,46 +561,54 @@ async def search_dronespots(
             detail="lat, lon, and area must all be provided if any are provided"
         )
 
-    dronespots_query = db.query(DronespotModel)
+    if order == 1 and lat is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="lat, lon, and area must be provided to sort by distance"
+        )
+
+    dronespots_query = select(DronespotModel)
 
+    distance_formula = None
     if lat is not None and lon is not None and area is not None:
         lat_radians = radians(lat)
         lon_radians = radians(lon)
 
         distance_formula = (
-            6371 * func.acos(
+            6371 * func.acos(func.least(1.0,
                 func.cos(lat_radians) * func.cos(func.radians(DronespotModel.lat)) *
                 func.cos(func.radians(DronespotModel.lon) - lon_radians) +
                 func.sin(lat_radians) * func.sin(func.radians(DronespotModel.lat))
-            )
+            ))
         )
 
-        dronespots_query = dronespots_query.filter(distance_formula <= area)
+        if spatial_index.ready:
+            nearby = spatial_index.search(lat, lon, area)
+            dronespots_query = dronespots_query.where(DronespotModel.id.in_(list(nearby.keys())))
+        else:
+            # (lat, lon) 인덱스를 타도록 사각형 범위로 먼저 거른 뒤 거리 계산
+            min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, area)
+            dronespots_query = dronespots_query.where(
+                DronespotModel.lat.between(min_lat, max_lat),
+                DronespotModel.lon.between(min_lon, max_lon),
+                distance_formula <= area
+            )
 
     if keyword:
-        starting_with_keyword = dronespots_query.filter(
-            DronespotModel.name.ilike(f"{keyword}%")
-        )
-        containing_keyword = dronespots_query.filter(
-            DronespotModel.name.ilike(f"%{keyword}%")
-        ).filter(
-            ~DronespotModel.id.in_([spot.id for spot in starting_with_keyword])
-        )
-        dronespots_query = starting_with_keyword.union_all(containing_keyword)
-
-        for dronespot in starting_with_keyword.all() + containing_keyword.all():
-            trend_spot = db.query(TrendDronespot).filter(TrendDronespot.dronespot_id == dronespot.id).first()
-            if trend_spot:
-                trend_spot.count += 1
-            else:
-                trend_spot = TrendDronespot(dronespot_id=dronespot.id, count=1)
-                db.add(trend_spot)
-            db.add(dronespot)
+        # 접두 일치 + 부분 일치(union_all) 는 결국 부분 일치 전체와 같다 (정렬은 아래에서)
+        if name_index.ready:
+            # 인메모리 bigram 색인으로 후보 id 를 먼저 구해서 PK 로 조회
+            dronespots_query = dronespots_query.where(DronespotModel.id.in_(name_index.search(keyword)))
+        else:
+            dronespots_query = dronespots_query.where(
+                DronespotModel.name.ilike(f"%{keyword}%")
+            )
 
-        db.commit()
+        # 트렌드 카운트는 id 만 조회해서 버퍼에 올리고, DB 반영은 스케줄러가 모아서 한다
+        trend_counter.increment((await db.scalars(dronespots_query.with_only_columns(DronespotModel.id))).all())
 
     if drone_type:
-        dronespots_query = dronespots_query.filter(DronespotModel.drone_type == drone_type)
+        dronespots_query = dronespots_query.where(DronespotModel.drone_type == drone_type)
 
     if not lat and not lon and not area and not keyword and not drone_type:
         raise HTTPException(
@@ -546,9 +616,17 @@ async def search_dronespots(
             detail="At least one of lat/lon/area, keyword, or drone_type must be provided."
         )
 
-    dronespots_query = dronespots_query.order_by(DronespotModel.name).offset((page_num - 1) * size).limit(size)
+    if order == 1:
+        dronespots_query = dronespots_query.order_by(distance_formula, DronespotModel.id)
+    elif keyword:
+        # 접두 일치를 먼저, 그 안에서 이름순
+        prefix_first = case((DronespotModel.name.istartswith(keyword, autoescape=True), 0), else_=1)
+        dronespots_query = dronespots_query.order_by(prefix_first, DronespotModel.name)
+    else:
+        dronespots_query = dronespots_query.order_by(DronespotModel.name)
+    dronespots_query = dronespots_query.offset((page_num - 1) * size).limit(size)
 
-    dronespots = dronespots_query.all()
+    dronespots = (await db.scalars(dronespots_query)).all()
 
     if not dronespots:
         raise HTTPException(
@@ -557,33 +635,25 @@ async def search_dronespots(
         )
 
     user_uid = user_data.get("sub") if user_data else None
+    aggregates = await get_dronespot_aggregates(db, [dronespot.id for dronespot in dronespots], user_uid, primary_db)
+    areas = await get_dronespot_areas(db, [dronespot.id for dronespot in dronespots])
 
     response_data = [
         {
             "id": dronespot.id,
             "name": dronespot.name,
-            "is_like": 1 if user_uid and db.query(UserDronespotLikeModel).filter(
-                UserDronespotLikeModel.user_uid == user_uid,
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).first() else 0,
+            "is_like": aggregates[dronespot.id]["is_like"],
             "location": {
                 "lat": dronespot.lat,
                 "lon": dronespot.lon,
                 "address": dronespot.address
             },
-            "likes_count": db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).scalar(),
-            "reviews_count": db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot.id
-            ).scalar(),
+            "likes_count": aggregates[dronespot.id]["likes_count"],
+            "reviews_count": aggregates[dronespot.id]["reviews_count"],
             "photo": dronespot.photo_url,
             "comment": dronespot.comment,
             "drone_type": dronespot.drone_type,
-            "area": [
-                {"id": 1, "name": "Area 1"},
-                {"id": 2, "name": "Area 2"}
-            ],
+            "area": areas[dronespot.id],
             "permit": {
                 "flight": dronespot.permit_flight,
                 "camera": dronespot.permit_camera
@@ -597,15 +667,15 @@ async def search_dronespots(
 @router.get("/dronespot/all", response_model=List[Dronespot])
 async def get_all_dronespot(
     drone_type: Optional[int] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
-    dronespots = db.query(DronespotModel)
+    dronespots_query = select(DronespotModel)
 
     if drone_type is not None:
-        dronespots = dronespots.filter(DronespotModel.drone_type == drone_type).all()
-    else:
-        dronespots = dronespots.all()
+        dronespots_query = dronespots_query.where(DronespotModel.drone_type == drone_type)
+    dronespots = (await db.scalars(dronespots_query)).all()
 
     if not dronespots:
         raise HTTPException(
@@ -614,33 +684,25 @@ async def get_all_dronespot(
         )
 
     user_uid = user_data.get("sub") if user_data else None
+    aggregates = await get_dronespot_aggregates(db, [dronespot.id for dronespot in dronespots], user_uid, primary_db)
+    areas = await get_dronespot_areas(db, [dronespot.id for dronespot in dronespots])
 
     response_data = [
         {
             "id": dronespot.id,
             "name": dronespot.name,
-            "is_like": 1 if user_uid and db.query(UserDronespotLikeModel).filter(
-                UserDronespotLikeModel.user_uid == user_uid,
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).first() else 0,
+            "is_like": aggregates[dronespot.id]["is_like"],
             "location": {
                 "lat": dronespot.lat,
                 "lon": dronespot.lon,
                 "address": dronespot.address
             },
-            "likes_count": db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).scalar(),
-            "reviews_count": db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot.id
-            ).scalar(),
+            "likes_count": aggregates[dronespot.id]["likes_count"],
+            "reviews_count": aggregates[dronespot.id]["reviews_count"],
             "photo": dronespot.photo_url,
             "comment": dronespot.comment,
             "drone_type": dronespot.drone_type,
-            "area": [
-                {"id": 1, "name": "Area 1"},
-                {"id": 2, "name": "Area 2"}
-            ],
+            "area": areas[dronespot.id],
             "permit": {
                 "flight": dronespot.permit_flight,
                 "camera": dronespot.permit_camera
@@ -654,49 +716,66 @@ async def get_all_dronespot(
 
 @router.get("/dronespot/recommend", response_model=List[Dronespot])
 async def recommend_dronespots(
+    response: Response,
     page_num: int = Query(1, ge=1),
     size: int = Query(10, ge=1),
-    db: Session = Depends(get_db),
+    seed: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
-    dronespots = db.query(DronespotModel).all()
-
-    if not dronespots:
+    if sampler.count(DRONESPOT) == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No dronespots found"
         )
-    random.shuffle(dronespots)
-
-    start_index = (page_num - 1) * size
-    end_index = start_index + size
-    recommend_dronespots = dronespots[start_index:end_index]
 
     user_uid = user_data.get("sub") if user_data else None
+    # seed 가 없으면 로그인 유저는 하루 동안 같은 순서, 비로그인은 새 seed (X-Seed 로 돌려받아 다음 페이지에 사용)
+    if seed is None:
+        if user_uid:
+            seed = zlib.crc32(f"{user_uid}:{date.today().isoformat()}".encode())
+        else:
+            seed = random.randrange(2 ** 31)
+    response.headers[SEED_HEADER] = str(seed)
+
+    # 미리 계산된 개인화 목록을 먼저 보여주고, 목록이 없거나 다 본 뒤에는 무작위 순열로 이어서 보여준다
+    start = (page_num - 1) * size
+    end = start + size
+    recommend_ids = (recommender.recommend(user_uid, start, end) or []) if user_uid else []
+    if len(recommend_ids) < size:
+        personalized_count = recommender.count(user_uid) if user_uid else 0
+        personalized_ids = set(recommender.dronespot_ids(user_uid)) if personalized_count else set()
+        # 순열에서 이번 페이지의 id 만 뽑아서 그 행만 조회
+        recommend_ids += [
+            dronespot_id
+            for dronespot_id in sampler.permuted(DRONESPOT, max(start - personalized_count, 0), end - personalized_count, seed)
+            if dronespot_id not in personalized_ids
+        ]
+    dronespots = {
+        dronespot.id: dronespot
+        for dronespot in (await db.scalars(select(DronespotModel).where(DronespotModel.id.in_(recommend_ids)))).all()
+    }
+    recommend_dronespots = [dronespots[dronespot_id] for dronespot_id in recommend_ids if dronespot_id in dronespots]
+
+    aggregates = await get_dronespot_aggregates(db, [dronespot.id for dronespot in recommend_dronespots], user_uid, primary_db)
+    areas = await get_dronespot_areas(db, [dronespot.id for dronespot in recommend_dronespots])
 
     response_data = [
         {
             "id": dronespot.id,
             "name": dronespot.name,
-            "is_like": 1 if user_uid and db.query(UserDronespotLikeModel).filter(
-                UserDronespotLikeModel.user_uid == user_uid,
-                UserDronespotLikeModel.drone_spot_id == dronespot.id
-            ).first() else 0,
+            "is_like": aggregates[dronespot.id]["is_like"],
             "location": {
                 "lat": dronespot.lat,
                 "lon": dronespot.lon,
                 "address": dronespot.address
             },
-            "likes_count": db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-                UserDronespotLikeModel.drone_spot_id == dronespot.id).scalar(),
-            "reviews_count": db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot.id).scalar(),
+            "likes_count": aggregates[dronespot.id]["likes_count"],
+            "reviews_count": aggregates[dronespot.id]["reviews_count"],
             "photo": dronespot.photo_url,
             "comment": dronespot.comment,
-            "area": [
-                {"id": 1, "name": "Area 1"},
-                {"id": 2, "name": "Area 2"}
-            ],
+            "area": areas[dronespot.id],
             "permit": {
                 "flight": dronespot.permit_flight,
                 "camera": dronespot.permit_camera
@@ -713,17 +792,20 @@ async def user_comment_write_dronespots(
     uid: str,
     page_num: int = Query(1, ge=1),
     size: int = Query(10, ge=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     order: int = Query(0, alias="order"),  # 0: 최신순, 1: 좋아요순
     user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
-    spot_datas = db.query(ReviewModel).filter(
+    spot_datas = (await db.scalars(select(ReviewModel).options(
+        selectinload(ReviewModel.dronespot)
+    ).where(
         ReviewModel.writer_uid == uid
     ).order_by(
         ReviewModel.flight_date.desc()
     ).group_by(
         ReviewModel.dronespot_id,
-    ).offset((page_num - 1) * size).limit(size).all()
+    ).offset((page_num - 1) * size).limit(size))).all()
 
     if not spot_datas:
         raise HTTPException(
@@ -732,30 +814,24 @@ async def user_comment_write_dronespots(
         )
 
     user_uid = user_data.get("sub") if user_data else None
+    aggregates = await get_dronespot_aggregates(db, [spot_data.dronespot_id for spot_data in spot_datas], user_uid, primary_db)
+    areas = await get_dronespot_areas(db, [spot_data.dronespot_id for spot_data in spot_datas])
 
     response_data = [
         {
             "id": dronespot.dronespot.id,
             "name": dronespot.dronespot.name,
-            "is_like": 1 if user_uid and db.query(UserDronespotLikeModel).filter(
-                UserDronespotLikeModel.user_uid == user_uid,
-                UserDronespotLikeModel.drone_spot_id == dronespot.dronespot.id
-            ).first() else 0,
+            "is_like": aggregates[dronespot.dronespot_id]["is_like"],
             "location": {
                 "lat": dronespot.dronespot.lat,
                 "lon": dronespot.dronespot.lon,
                 "address": dronespot.dronespot.address
             },
-            "likes_count": db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-                UserDronespotLikeModel.drone_spot_id == dronespot.dronespot.id).scalar(),
-            "reviews_count": db.query(func.count(ReviewModel.id)).filter(
-                ReviewModel.dronespot_id == dronespot.dronespot.id).scalar(),
+            "likes_count": aggregates[dronespot.dronespot_id]["likes_count"],
+            "reviews_count": aggregates[dronespot.dronespot_id]["reviews_count"],
             "photo": dronespot.dronespot.photo_url,
             "comment": dronespot.dronespot.comment,
-            "area": [
-                {"id": 1, "name": "Area 1"},
-                {"id": 2, "name": "Area 2"}
-            ],
+            "area": areas[dronespot.dronespot_id],
             "permit": {
                 "flight": dronespot.dronespot.permit_flight,
                 "camera": dronespot.dronespot.permit_camera
@@ -769,35 +845,38 @@ async def user_comment_write_dronespots(
 @router.get("/dronespot/{dronespot_id}", response_model=DronespotResponse)
 async def get_dronespot(
         dronespot_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_read_db),
+        primary_db: AsyncSession = Depends(get_async_db),
         user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
-    dronespot = db.query(DronespotModel).filter(DronespotModel.id == dronespot_id).first()
+    dronespot = await db.scalar(select(DronespotModel).where(DronespotModel.id == dronespot_id))
     if not dronespot:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Dronespot not found"
         )
 
-    likes_count = db.query(func.count(UserDronespotLikeModel.user_uid)).filter(
-        UserDronespotLikeModel.drone_spot_id == dronespot_id).scalar()
-
+    # 본인이 방금 누른 좋아요가 바로 보이도록 primary 에서 조회
     is_like = (
-        db.query(UserDronespotLikeModel)
-        .filter(
-            UserDronespotLikeModel.user_uid == user_data["sub"],
-            UserDronespotLikeModel.drone_spot_id == dronespot_id
-        )
-        .count() if user_data and user_data.get("sub") else 0
+        await primary_db.scalar(
+            select(func.count())
+            .select_from(UserDronespotLikeModel)
+            .where(
+                UserDronespotLikeModel.user_uid == user_data["sub"],
+                UserDronespotLikeModel.drone_spot_id == dronespot_id
+            )
+        ) if user_data and user_data.get("sub") else 0
     )
 
-    reviews = db.query(ReviewModel).filter(ReviewModel.dronespot_id == dronespot_id).order_by(
-        ReviewModel.id.desc()).limit(3).all()
+    reviews = (await db.scalars(select(ReviewModel).options(
+        selectinload(ReviewModel.dronespot)
+    ).where(ReviewModel.dronespot_id == dronespot_id).order_by(
+        ReviewModel.id.desc()).limit(3))).all()
 
     review_data = []
     for review in reviews:
-        writer = db.query(UserModel).filter(UserModel.uid == review.writer_uid).first()
+        writer = await db.scalar(select(UserModel).where(UserModel.uid == review.writer_uid))
         review_data.append({
             "id": review.id,
             "writer": None if writer is None else {"uid": writer.uid, "name": writer.name},
@@ -808,24 +887,23 @@ async def get_dronespot(
             "date": review.flight_date.isoformat(),
             "comment": review.comment,
             "photo": review.photo_url,
-            "like_count": db.query(func.count(UserReviewLike.user_uid)).filter(
-                UserReviewLike.review_id == review.id).scalar(),
-            "is_like": 1 if user_data and db.query(UserReviewLike).filter(
+            "like_count": review.likes_count,
+            "is_like": 1 if user_data and await primary_db.scalar(select(UserReviewLike).where(
                 UserReviewLike.user_uid == user_data["sub"],
                 UserReviewLike.review_id == review.id
-            ).first() else 0
+            )) else 0
         })
 
-    course_visits = db.query(CourseVisitModel).filter(
+    course_visits = (await db.scalars(select(CourseVisitModel).where(
         CourseVisitModel.dronespot_id == dronespot_id
     ).group_by(
         CourseVisitModel.course_id,
         CourseVisitModel.dronespot_id
-    ).limit(3).all()
+    ).limit(3))).all()
 
     courses = []
     for visit in course_visits:
-        course = db.query(CourseModel).filter(CourseModel.id == visit.course_id).first()
+        course = await db.scalar(select(CourseModel).where(CourseModel.id == visit.course_id))
         if course:
             courses.append({
                 "id": course.id,
@@ -837,13 +915,17 @@ async def get_dronespot(
                 "duration": course.duration
             })
 
-    accommodations = db.query(PlaceModel).join(DronePlaceModel, DronePlaceModel.place_id == PlaceModel.id).filter(
-        DronePlaceModel.dronespot_id == dronespot_id, PlaceModel.place_type_id == 32).order_by(func.random()).limit(
-        5).all()
-
-    restaurants = db.query(PlaceModel).join(DronePlaceModel, DronePlaceModel.place_id == PlaceModel.id).filter(
-        DronePlaceModel.dronespot_id == dronespot_id, PlaceModel.place_type_id == 39).order_by(func.random()).limit(
-        5).all()
+    # 주변 숙소(32) / 식당(39) 중 무작위 5개씩
+    accommodation_ids = sampler.sample(place_key(dronespot_id, 32), 5)
+    restaurant_ids = sampler.sample(place_key(dronespot_id, 39), 5)
+    places = {
+        place.id: place
+        for place in (await db.scalars(select(PlaceModel).where(
+            PlaceModel.id.in_(accommodation_ids + restaurant_ids)
+        ))).all()
+    }
+    accommodations = [places[place_id] for place_id in accommodation_ids if place_id in places]
+    restaurants = [places[place_id] for place_id in restaurant_ids if place_id in places]
 
     accommodations_data = [{
         "id": place.id,
@@ -871,27 +953,17 @@ async def get_dronespot(
         "place_type_id": place.place_type_id
     } for place in restaurants]
 
-    point = Point(dronespot.lon, dronespot.lat)
-    region = settings.AREA_SHP_DATA[settings.AREA_SHP_DATA.geometry.contains(point)]
-    area = []
-
-    for c in range(region.shape[0]):
-        area.append({
-            'id': region.iloc[c, 3],
-            'name': region.iloc[c, 2]
-        })
-
+    area = (await get_dronespot_areas(db, [dronespot_id]))[dronespot_id]
     if len(area) == 0:
-        area.append({
-            'id': 9,
-            'name': '해당없음'
-        })
+        # 읽기 세션은 레플리카일 수 있으므로 저장은 primary 세션으로
+        area = await save_dronespot_areas(primary_db, dronespot)
+        await primary_db.commit()
 
     converter = CoordinateConverter()
     x, y = converter.convert(lon=float(dronespot.lon), lat=float(dronespot.lat), x=None, y=None, code=0)
     whether = None
     try:
-        whether = await get_whether_data(dronespot_id, x, y)
+        whether = await get_whether_data(x, y)
     except Exception as e:
         whether = None
 
@@ -902,8 +974,8 @@ async def get_dronespot(
         'whether': None if whether is None else whether,
         "is_like": is_like,
         "location": {"lat": dronespot.lat, "lon": dronespot.lon, "address": dronespot.address},
-        "likes_count": likes_count,
-        "reviews_count": len(reviews),
+        "likes_count": dronespot.likes_count,
+        "reviews_count": dronespot.reviews_count,
         "photo_url": dronespot.photo_url,
         "comment": dronespot.comment,
         "area": area,
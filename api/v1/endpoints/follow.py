@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from database.mariadb_session import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from database.mariadb_session import get_async_db
 
 from models import User, Follow
 from schemas import (
@@ -8,8 +10,9 @@ from schemas import (
     Following as FollowingSchema,
 )
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from core.auth import verify_user_token
+from core.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
@@ -17,7 +20,7 @@ router = APIRouter()
 async def following(
         target_uid: str,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     if user_data is None:
         raise HTTPException(
@@ -27,12 +30,12 @@ async def following(
         )
 
     uid = user_data["sub"]
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.uid == uid
-    ).first()
-    target_user = db.query(User).filter(
+    ))
+    target_user = await db.scalar(select(User).where(
         User.uid == target_uid
-    ).first()
+    ))
     if user is None or target_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,10 +43,10 @@ async def following(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    follow_follower = db.query(Follow).filter(
+    follow_follower = await db.scalar(select(Follow).where(
         Follow.follower_uid == user.uid,
         Follow.following_uid == target_user.uid
-    ).first()
+    ))
     if follow_follower is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -55,7 +58,7 @@ async def following(
         following_uid=target_user.uid,
     )
     db.add(follow_follower)
-    db.commit()
+    await db.commit()
 
     return target_user
 
@@ -63,7 +66,7 @@ async def following(
 async def cancel_following(
         target_uid: str,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     if user_data is None:
         raise HTTPException(
@@ -73,12 +76,12 @@ async def cancel_following(
         )
 
     uid = user_data["sub"]
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.uid == uid
-    ).first()
-    target_user = db.query(User).filter(
+    ))
+    target_user = await db.scalar(select(User).where(
         User.uid == target_uid
-    ).first()
+    ))
     if user is None or target_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,10 +89,10 @@ async def cancel_following(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    follow_follower = db.query(Follow).filter(
+    follow_follower = await db.scalar(select(Follow).where(
         Follow.follower_uid == user.uid,
         Follow.following_uid == target_user.uid
-    ).first()
+    ))
 
     if follow_follower is None:
         raise HTTPException(
@@ -97,8 +100,8 @@ async def cancel_following(
             detail='해당 유저를 팔로우 하지 않습니다.'
         )
 
-    db.delete(follow_follower)
-    db.commit()
+    await db.delete(follow_follower)
+    await db.commit()
 
     return target_user
 
@@ -106,7 +109,7 @@ async def cancel_following(
 async def cancel_following(
         target_uid: str,
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     if user_data is None:
         raise HTTPException(
@@ -116,12 +119,12 @@ async def cancel_following(
         )
 
     uid = user_data["sub"]
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.uid == uid
-    ).first()
-    target_user = db.query(User).filter(
+    ))
+    target_user = await db.scalar(select(User).where(
         User.uid == target_uid
-    ).first()
+    ))
     if user is None or target_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -129,10 +132,10 @@ async def cancel_following(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    follow_follower = db.query(Follow).filter(
+    follow_follower = await db.scalar(select(Follow).where(
         Follow.follower_uid == target_user.uid,
         Follow.following_uid == user.uid
-    ).first()
+    ))
 
     if follow_follower is None:
         raise HTTPException(
@@ -140,17 +143,19 @@ async def cancel_following(
             detail='해당 유저는 팔로우 하지 않습니다.'
         )
 
-    db.delete(follow_follower)
-    db.commit()
+    await db.delete(follow_follower)
+    await db.commit()
 
     return target_user
 
 @router.get("/follow/following", response_model=List[FollowingSchema], status_code=status.HTTP_200_OK)
 async def list_following(
+        response: Response,
         size: int = 20,
         page: int = 1,
+        cursor: Optional[str] = Query(None),
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     if user_data is None:
         raise HTTPException(
@@ -160,9 +165,9 @@ async def list_following(
         )
 
     uid = user_data["sub"]
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.uid == uid
-    ).first()
+    ))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -170,9 +175,12 @@ async def list_following(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    following_list = db.query(Follow).filter(
+    # 팔로우 직후 목록에 바로 보이도록 primary 에서 조회
+    following_list = (await db.scalars(paginate(select(Follow).options(
+        selectinload(Follow.following)
+    ).where(
         Follow.follower_uid == user.uid,
-    ).offset((page - 1) * size).limit(size).all()
+    ), [(Follow.following_uid, False)], cursor, page, size))).all()
 
     user_list = []
     for following in following_list:
@@ -186,14 +194,17 @@ async def list_following(
             'one_liner': following_info.one_liner,
         })
 
+    set_next_cursor(response, following_list, size, lambda following: [following.following_uid])
     return user_list
 
 @router.get("/follow/follower", response_model=List[FollowingSchema], status_code=status.HTTP_200_OK)
 async def list_follower(
+        response: Response,
         size: int = 20,
         page: int = 1,
+        cursor: Optional[str] = Query(None),
         user_data: Dict[str, Any] = Depends(verify_user_token),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     if user_data is None:
         raise HTTPException(
@@ -203,9 +214,9 @@ async def list_follower(
         )
 
     uid = user_data["sub"]
-    user = db.query(User).filter(
+    user = await db.scalar(select(User).where(
         User.uid == uid
-    ).first()
+    ))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -213,9 +224,12 @@ async def list_follower(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    follower_list = db.query(Follow).filter(
+    # 팔로우 직후 목록에 바로 보이도록 primary 에서 조회
+    follower_list = (await db.scalars(paginate(select(Follow).options(
+        selectinload(Follow.follower)
+    ).where(
         Follow.following_uid == user.uid,
-    ).offset((page - 1) * size).limit(size).all()
+    ), [(Follow.follower_uid, False)], cursor, page, size))).all()
 
     user_list = []
     for follower in follower_list:
@@ -229,4 +243,5 @@ async def list_follower(
             'one_liner': follower_info.one_liner,
         })
 
+    set_next_cursor(response, follower_list, size, lambda follower: [follower.follower_uid])
     return user_list
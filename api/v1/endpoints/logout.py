@@ -13,7 +13,7 @@ from database.mariadb_session import get_db
 router = APIRouter()
 
 @router.post("/logout")
-async def logout(
+def logout(
         logout_info: Logout,
         request: Request,
         db: Session = Depends(get_db)
@@ -3,13 +3,13 @@ import uuid
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Form, status
 
-from sqlalchemy import null
-from sqlalchemy.orm import Session
+from sqlalchemy import null, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
 from core.auth import verify_user_token
 from core.config import settings
-from database.mariadb_session import get_db
+from database.mariadb_session import get_async_db
 from models import (
     User as UserModel,
     Follow as FollowModel,
@@ -23,12 +23,12 @@ router = APIRouter()
 @router.get("/profile/{uid}", response_model=Profile, status_code=200)
 async def get_user_profile(
     uid: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
     #print(uid)
-    db_user = db.query(UserModel).filter(UserModel.uid == uid).first()
+    db_user = await db.scalar(select(UserModel).where(UserModel.uid == uid))
     #print(db_user)
 
     # 로그인 한 유저일 경우, 팔로우 여부 확인
@@ -36,16 +36,16 @@ async def get_user_profile(
         if user['sub']==db_user.uid:
             is_following = None
         else:
-            is_following = db.query(FollowModel).filter(
+            is_following = await db.scalar(select(func.count()).select_from(FollowModel).where(
                 FollowModel.follower_uid == user['sub'],
                 FollowModel.following_uid == db_user.uid
-            ).count()
+            ))
     else:
         is_following = 0  # 로그인하지 않은 경우
 
-    following_count = db.query(FollowModel).filter(FollowModel.follower_uid == db_user.uid).count()
-    follower_count = db.query(FollowModel).filter(FollowModel.following_uid == db_user.uid).count()
-    post_count = db.query(ReviewModel).filter(ReviewModel.writer_uid == db_user.uid).count()
+    following_count = await db.scalar(select(func.count()).select_from(FollowModel).where(FollowModel.follower_uid == db_user.uid))
+    follower_count = await db.scalar(select(func.count()).select_from(FollowModel).where(FollowModel.following_uid == db_user.uid))
+    post_count = await db.scalar(select(func.count()).select_from(ReviewModel).where(ReviewModel.writer_uid == db_user.uid))
 
     response = Profile(
         uid=db_user.uid,
@@ -69,7 +69,7 @@ async def patch_user_profile(
     one_liner: str = Form(None),
     drone: str = Form(None),
     file: UploadFile = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
@@ -79,7 +79,7 @@ async def patch_user_profile(
     if name is None and one_liner is None and drone is None and file is None:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="적어도 하나 이상의 필드가 존재해야 합니다.")
 
-    db_user = db.query(UserModel).filter(UserModel.uid == uid).first()
+    db_user = await db.scalar(select(UserModel).where(UserModel.uid == uid))
 
     if file:
         file_extension = os.path.splitext(file.filename)[1]
@@ -97,13 +97,13 @@ async def patch_user_profile(
     if drone:
         db_user.drone = drone
 
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
 
-    following_count = db.query(FollowModel).filter(FollowModel.follower_uid == db_user.uid).count()
-    follower_count = db.query(FollowModel).filter(FollowModel.following_uid == db_user.uid).count()
-    post_count = db.query(ReviewModel).filter(ReviewModel.writer_uid == db_user.uid).count()
+    following_count = await db.scalar(select(func.count()).select_from(FollowModel).where(FollowModel.follower_uid == db_user.uid))
+    follower_count = await db.scalar(select(func.count()).select_from(FollowModel).where(FollowModel.following_uid == db_user.uid))
+    post_count = await db.scalar(select(func.count()).select_from(ReviewModel).where(ReviewModel.writer_uid == db_user.uid))
 
     response = JSONResponse(content={
         "uid": db_user.uid,
@@ -9,7 +9,7 @@ from starlette.responses import Response
 router = APIRouter()
 
 @router.post("/refresh", response_model=AccessTokenResponse)
-async def refresh_access_token(
+def refresh_access_token(
         refresh_info: RefreshTokenRequest,
         request: Request,
         db: Session = Depends(get_db)
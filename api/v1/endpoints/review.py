@@ -1,14 +1,18 @@
 import uuid
 from typing import Dict, Any, Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Response, status
 from fastapi.responses import JSONResponse
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from starlette.staticfiles import StaticFiles
 
 from core.auth import verify_user_token
-from database.mariadb_session import get_db
+from core.pagination import paginate, set_next_cursor
+from core.sampler import sampler, REVIEW
+from crud.crud_dronespot import increase_dronespot_reviews_count, increase_review_likes_count
+from database.mariadb_session import get_async_db, get_async_read_db
 from models import (
     Review as ReviewModel,
     Dronespot as DronespotModel,
@@ -34,14 +38,14 @@ async def create_review(
         permit_flight: int = Form(...),
         permit_camera: int = Form(...),
         file: Optional[UploadFile] = File(None),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user: Dict[str, Any] = Depends(verify_user_token)
 ):
-    user_db = db.query(UserModel).filter(UserModel.uid == user.get("sub")).first()
+    user_db = await db.scalar(select(UserModel).where(UserModel.uid == user.get("sub")))
     print(user_db)
 
     # 드론 스팟 확인
-    drone_spot = db.query(DronespotModel).filter(DronespotModel.id == drone_spot_id).first()
+    drone_spot = await db.scalar(select(DronespotModel).where(DronespotModel.id == drone_spot_id))
     if not drone_spot:
         raise HTTPException(status_code=404, detail="드론 스팟을 찾을 수 없습니다.")
 
@@ -57,8 +61,10 @@ async def create_review(
         comment=comment
     )
     db.add(db_review)
-    db.commit()
-    db.refresh(db_review)
+    await increase_dronespot_reviews_count(db, drone_spot_id, 1)
+    await db.commit()
+    await db.refresh(db_review)
+    sampler.add(REVIEW, db_review.id)
 
     photo_url = None
     if file:
@@ -70,8 +76,8 @@ async def create_review(
         photo_url = f"/media/{new_filename}"
         print(photo_url)
         db_review.photo_url = photo_url
-        db.commit()
-        db.refresh(db_review)
+        await db.commit()
+        await db.refresh(db_review)
 
     like_count = 0,  # 초기 좋아요 개수
     is_like = 0  # 초기 좋아요 상태
@@ -105,17 +111,17 @@ async def patch_review(
         date: Optional[str] = Form(None),
         drone: Optional[str] = Form(None),
         file: Optional[UploadFile] = File(None),
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user: Dict[str, Any] = Depends(verify_user_token)
 ):
-    user_db = db.query(UserModel).filter(UserModel.uid == user.get("sub")).first()
+    user_db = await db.scalar(select(UserModel).where(UserModel.uid == user.get("sub")))
 
-    db_review = db.query(ReviewModel).filter(ReviewModel.id == review_id).first()
+    db_review = await db.scalar(select(ReviewModel).where(ReviewModel.id == review_id))
     if not db_review:
         raise HTTPException(status_code=404, detail="해당 리뷰를 찾을 수 없습니다.")
 
     # 드론 스팟 확인
-    drone_spot = db.query(DronespotModel).filter(DronespotModel.id == db_review.dronespot_id).first()
+    drone_spot = await db.scalar(select(DronespotModel).where(DronespotModel.id == db_review.dronespot_id))
     if not drone_spot:
         raise HTTPException(status_code=404, detail="드론 스팟을 찾을 수 없습니다.")
 
@@ -143,20 +149,19 @@ async def patch_review(
         photo_url = f"/media/{new_filename}"
         db_review.photo_url = photo_url
 
-    db.commit()
-    db.refresh(db_review)
+    await db.commit()
+    await db.refresh(db_review)
 
-    is_like = (
-        db.query(UserReviewLikeModel)
-        .filter(
+    is_like = await db.scalar(
+        select(func.count())
+        .select_from(UserReviewLikeModel)
+        .where(
             UserReviewLikeModel.user_uid == user_db.uid,
             UserReviewLikeModel.review_id == review_id
         )
-        .count()
     )
 
-    likes_count = db.query(func.count(UserReviewLikeModel.user_uid)).filter(
-        UserReviewLikeModel.review_id == review_id).scalar()
+    likes_count = db_review.likes_count
 
     response_data = {
         "id": db_review.id,
@@ -183,20 +188,20 @@ async def patch_review(
 @router.post("/like/review/{review_id}", status_code=200)
 async def like_review(
         review_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user: Dict[str, Any] = Depends(verify_user_token)
 ):
-    user_db = db.query(UserModel).filter(UserModel.uid == user.get("sub")).first()
+    user_db = await db.scalar(select(UserModel).where(UserModel.uid == user.get("sub")))
     if not user_db:
         raise HTTPException(
             status_code=404,
             detail="해당 유저를 찾을 수 없습니다."
         )
 
-    like_exists = db.query(UserReviewLikeModel).filter(
+    like_exists = await db.scalar(select(UserReviewLikeModel).where(
         UserReviewLikeModel.user_uid == user_db.uid,
         UserReviewLikeModel.review_id == review_id
-    ).first()
+    ))
     if like_exists:
         raise HTTPException(
             status_code=400,
@@ -208,7 +213,8 @@ async def like_review(
         review_id=review_id
     )
     db.add(new_like)
-    db.commit()
+    await increase_review_likes_count(db, review_id, 1)
+    await db.commit()
 
     return JSONResponse(content={"메시지": "해당 리뷰에 좋아요 반영이 되었습니다."}, status_code=200)
 
@@ -216,20 +222,20 @@ async def like_review(
 @router.delete("/like/review/{review_id}", status_code=200)
 async def unlike_review(
         review_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user: Dict[str, Any] = Depends(verify_user_token)
 ):
-    user_db = db.query(UserModel).filter(UserModel.uid == user.get("sub")).first()
+    user_db = await db.scalar(select(UserModel).where(UserModel.uid == user.get("sub")))
     if not user_db:
         raise HTTPException(
             status_code=404,
             detail="해당 유저를 찾을 수 없습니다."
         )
 
-    like_exists = db.query(UserReviewLikeModel).filter(
+    like_exists = await db.scalar(select(UserReviewLikeModel).where(
         UserReviewLikeModel.user_uid == user_db.uid,
         UserReviewLikeModel.review_id == review_id
-    ).first()
+    ))
 
     if not like_exists:
         raise HTTPException(
@@ -237,17 +243,20 @@ async def unlike_review(
             detail="좋아요를 누른 리뷰가 아닙니다."
         )
 
-    db.delete(like_exists)
-    db.commit()
+    await db.delete(like_exists)
+    await increase_review_likes_count(db, review_id, -1)
+    await db.commit()
 
     return JSONResponse(content={"메시지": "해당 리뷰에 좋아요를 취소했습니다."}, status_code=200)
 
 @router.get("/review/like/{user_id}", response_model=list[ReviewDronespot], status_code=200)
-def get_like_user_reviews(
+async def get_like_user_reviews(
     user_id: str,
+    http_response: Response,
     page_num: int = Query(1, alias="page_num"),
     size: int = Query(10, alias="size"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
     if not user or user.get("sub") != user_id:
@@ -256,13 +265,16 @@ def get_like_user_reviews(
             detail="Forbidden"
         )
 
-    liked_review = (
-        db.query(ReviewModel)
+    # 본인이 방금 누른 좋아요가 바로 보이도록 primary 에서 조회
+    liked_rows = (await db.execute(paginate(
+        select(ReviewModel, UserReviewLikeModel.created_at)
+        .options(selectinload(ReviewModel.user), selectinload(ReviewModel.dronespot))
         .join(UserReviewLikeModel, ReviewModel.id == UserReviewLikeModel.review_id)
-        .filter(UserReviewLikeModel.user_uid == user_id)
-        .order_by(UserReviewLikeModel.created_at.desc())
-        .offset((page_num - 1) * size).limit(size).all()
-    )
+        .where(UserReviewLikeModel.user_uid == user_id),
+        [(UserReviewLikeModel.created_at, True), (UserReviewLikeModel.review_id, True)],
+        cursor, page_num, size
+    ))).all()
+    liked_review = [row[0] for row in liked_rows]
 
     if not liked_review:
         raise HTTPException(
@@ -274,14 +286,14 @@ def get_like_user_reviews(
     for review in liked_review:
         # 로그인한 유저일 경우, 좋아요 여부 확인
         if user:
-            is_like = db.query(UserReviewLikeModel).filter(
+            is_like = await db.scalar(select(func.count()).select_from(UserReviewLikeModel).where(
                 UserReviewLikeModel.review_id == review.id,
                 UserReviewLikeModel.user_uid == user['sub']
-            ).count()
+            ))
         else:
             is_like = 0  # 로그인하지 않은 경우
 
-        like_count = db.query(UserReviewLikeModel).filter(UserReviewLikeModel.review_id == review.id).count()
+        like_count = review.likes_count
         response.append(ReviewDronespot(
             id=review.id,
             writer=None if review.writer_uid is None else {
@@ -302,42 +314,48 @@ def get_like_user_reviews(
             is_like=is_like
         ))
 
+    set_next_cursor(http_response, liked_rows, size, lambda row: [row.created_at, row[0].id])
     return response
 
 @router.get("/userReview/{user_id}", response_model=list[ReviewDronespot], status_code=200)
-def get_user_reviews(
+async def get_user_reviews(
     user_id: str,
+    http_response: Response,
     page_num: int = Query(1, alias="page_num"),
     size: int = Query(10, alias="size"),
     order: int = Query(0, alias="order"),  # 0: 최신순, 1: 좋아요순
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
-    db_review = db.query(ReviewModel).filter(ReviewModel.writer_uid == user_id)
+    db_review = select(ReviewModel).options(
+        selectinload(ReviewModel.user), selectinload(ReviewModel.dronespot)
+    ).where(ReviewModel.writer_uid == user_id)
 
     if order == 1:
         # 좋아요 순 정렬
-        db_review = db_review.outerjoin(UserReviewLikeModel).group_by(ReviewModel.id).order_by(func.count(UserReviewLikeModel.review_id).desc())
+        sort_keys = [(ReviewModel.likes_count, True), (ReviewModel.id, True)]
     else:
         # 최신순 정렬
-        db_review = db_review.order_by(ReviewModel.flight_date.desc())
+        sort_keys = [(ReviewModel.flight_date, True), (ReviewModel.id, True)]
 
-    # 페이징
-    reviews = db_review.offset((page_num - 1) * size).limit(size).all()
+    # 페이징 (cursor 가 있으면 keyset)
+    reviews = (await db.scalars(paginate(db_review, sort_keys, cursor, page_num, size))).all()
 
     response = []
     for review in reviews:
         # 로그인한 유저일 경우, 좋아요 여부 확인
         if user:
-            is_like = db.query(UserReviewLikeModel).filter(
+            is_like = await primary_db.scalar(select(func.count()).select_from(UserReviewLikeModel).where(
                 UserReviewLikeModel.review_id == review.id,
                 UserReviewLikeModel.user_uid == user['sub']
-            ).count()
+            ))
         else:
             is_like = 0  # 로그인하지 않은 경우
 
-        like_count = db.query(UserReviewLikeModel).filter(UserReviewLikeModel.review_id == review.id).count()
+        like_count = review.likes_count
         response.append(ReviewDronespot(
             id=review.id,
             writer=None if review.writer_uid is None else {
@@ -358,43 +376,49 @@ def get_user_reviews(
             drone=review.drone
         ))
 
+    set_next_cursor(http_response, reviews, size, lambda review: [getattr(review, column.key) for column, _ in sort_keys])
     return response
 
 
 @router.get("/spotReview/{drone_spot_id}", response_model=list[ReviewDronespot], status_code=200)
-def get_spot_reviews(
+async def get_spot_reviews(
     drone_spot_id: int,
+    http_response: Response,
     page_num: int = Query(1, alias="page_num"),
     size: int = Query(10, alias="size"),
     order: int = Query(0, alias="order"),  # 0: 최신순, 1: 좋아요순
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
-    db_review = db.query(ReviewModel).filter(ReviewModel.dronespot_id == drone_spot_id)
+    db_review = select(ReviewModel).options(
+        selectinload(ReviewModel.user), selectinload(ReviewModel.dronespot)
+    ).where(ReviewModel.dronespot_id == drone_spot_id)
 
     if order == 1:
         # 좋아요 순 정렬
-        db_review = db_review.outerjoin(UserReviewLikeModel).group_by(ReviewModel.id).order_by(func.count(UserReviewLikeModel.review_id).desc())
+        sort_keys = [(ReviewModel.likes_count, True), (ReviewModel.id, True)]
     else:
         # 최신순 정렬
-        db_review = db_review.order_by(ReviewModel.id.desc())
+        sort_keys = [(ReviewModel.id, True)]
 
-    # 페이징
-    reviews = db_review.offset((page_num - 1) * size).limit(size).all()
+    # 페이징 (cursor 가 있으면 keyset)
+    reviews = (await db.scalars(paginate(db_review, sort_keys, cursor, page_num, size))).all()
 
     response = []
     for review in reviews:
         # 로그인한 유저일 경우, 좋아요 여부 확인
         if user:
-            is_like = db.query(UserReviewLikeModel).filter(
+            is_like = await primary_db.scalar(select(func.count()).select_from(UserReviewLikeModel).where(
                 UserReviewLikeModel.review_id == review.id,
                 UserReviewLikeModel.user_uid == user['sub']
-            ).count()
+            ))
         else:
             is_like = 0  # 로그인하지 않은 경우
 
-        like_count = db.query(UserReviewLikeModel).filter(UserReviewLikeModel.review_id == review.id).count()
+        like_count = review.likes_count
         response.append(ReviewDronespot(
             id=review.id,
             writer=None if review.writer_uid is None else {
@@ -415,31 +439,35 @@ def get_spot_reviews(
             drone=review.drone
         ))
 
+    set_next_cursor(http_response, reviews, size, lambda review: [getattr(review, column.key) for column, _ in sort_keys])
     return response
 
 
 @router.get("/review/{review_id}", response_model=list[Review], status_code=200)
-def get_review(
+async def get_review(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
-    db_review = db.query(ReviewModel).filter(ReviewModel.id == review_id).first()
+    db_review = await db.scalar(select(ReviewModel).options(
+        selectinload(ReviewModel.user), selectinload(ReviewModel.dronespot)
+    ).where(ReviewModel.id == review_id))
     if not db_review:
         raise HTTPException(status_code=400, detail="존재하지 않는 리뷰 아이디입니다.")
 
     response = []
     # 로그인한 유저일 경우, 좋아요 여부 확인
     if user:
-        is_like = db.query(UserReviewLikeModel).filter(
+        is_like = await primary_db.scalar(select(func.count()).select_from(UserReviewLikeModel).where(
             UserReviewLikeModel.review_id == db_review.id,
             UserReviewLikeModel.user_uid == user['sub']
-        ).count()
+        ))
     else:
         is_like = 0  # 로그인하지 않은 경우
 
-    like_count = db.query(UserReviewLikeModel).filter(UserReviewLikeModel.review_id == review_id).count()
+    like_count = db_review.likes_count
     response.append(Review(
         id=review_id,
         writer=None if db_review.writer_uid is None else {
@@ -463,28 +491,35 @@ def get_review(
 
 
 @router.get("/trend/review", response_model=List[Review], status_code=200)
-def get_trend_reviews(
+async def get_trend_reviews(
     page_num: int = 1,
     size: int = 10,
-    db: Session = Depends(get_db),
+    seed: Optional[int] = Query(None),  # 같은 seed 로 요청하면 같은 무작위 순서로 페이지를 넘긴다
+    db: AsyncSession = Depends(get_async_read_db),
+    primary_db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
 
-    reviews = (db.query(ReviewModel).order_by(func.random())
-               .offset((page_num - 1) * size).limit(size).all())
+    review_ids = sampler.sample(REVIEW, size, page_num, seed)
+    reviews = (await db.scalars(select(ReviewModel).options(
+        selectinload(ReviewModel.user), selectinload(ReviewModel.dronespot)
+    ).where(ReviewModel.id.in_(review_ids)))).all()
+    # 뽑힌 순서대로
+    order = {review_id: i for i, review_id in enumerate(review_ids)}
+    reviews = sorted(reviews, key=lambda review: order[review.id])
 
     response = []
     for review in reviews:
         # 로그인한 유저일 경우, 좋아요 여부 확인
         if user:
-            is_like = db.query(UserReviewLikeModel).filter(
+            is_like = await primary_db.scalar(select(func.count()).select_from(UserReviewLikeModel).where(
                 UserReviewLikeModel.review_id == review.id,
                 UserReviewLikeModel.user_uid == user['sub']
-            ).count()
+            ))
         else:
             is_like = 0  # 로그인하지 않은 경우
 
-        like_count = db.query(UserReviewLikeModel).filter(UserReviewLikeModel.review_id == review.id).count()
+        like_count = review.likes_count
         response.append(Review(
             id=review.id,
             writer=None if review.writer_uid is None else {
@@ -507,27 +542,31 @@ def get_trend_reviews(
     return response
 
 @router.delete("/review/{review_id}", status_code=200)
-def delete_review(
+async def delete_review(
     review_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
-    user_db = db.query(UserModel).filter(UserModel.uid == user.get("sub")).first()
+    user_db = await db.scalar(select(UserModel).where(UserModel.uid == user.get("sub")))
     if not user_db:
         raise HTTPException(
             status_code=404,
             detail="해당 유저를 찾을 수 없습니다."
         )
-    db_review = db.query(ReviewModel).filter(ReviewModel.id == review_id).first()
+    db_review = await db.scalar(select(ReviewModel).where(ReviewModel.id == review_id))
     if not db_review:
         raise HTTPException(status_code=400, detail="존재하지 않는 리뷰 아이디입니다.")
 
     if user_db.is_admin == 1:
-        db.delete(db_review)
-        db.commit()
+        await db.delete(db_review)
+        await increase_dronespot_reviews_count(db, db_review.dronespot_id, -1)
+        await db.commit()
+        sampler.remove(REVIEW, review_id)
     elif user_db.is_admin == 0 and user_db.uid == db_review.writer_uid:
-        db.delete(db_review)
-        db.commit()
+        await db.delete(db_review)
+        await increase_dronespot_reviews_count(db, db_review.dronespot_id, -1)
+        await db.commit()
+        sampler.remove(REVIEW, review_id)
     else:
         raise HTTPException(
             status_code=400,
@@ -539,7 +578,7 @@ def delete_review(
 @router.post('/review/report/{review_id}', status_code=status.HTTP_204_NO_CONTENT)
 async def report_review(
         review_id: int,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
 ):
     if user_data is None:
@@ -550,9 +589,9 @@ async def report_review(
         )
 
     uid = user_data["sub"]
-    user = db.query(UserModel).filter(
+    user = await db.scalar(select(UserModel).where(
         UserModel.uid == uid
-    ).first()
+    ))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -560,19 +599,19 @@ async def report_review(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    review = db.query(ReviewModel).filter(
+    review = await db.scalar(select(ReviewModel).where(
         ReviewModel.id == review_id
-    ).first()
+    ))
     if review is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="존재하지 않는 리뷰입니다.",
         )
 
-    review_report = db.query(ReviewReportModel).filter(
+    review_report = await db.scalar(select(ReviewReportModel).where(
         ReviewReportModel.review_id == review_id,
         ReviewReportModel.user_uid == uid
-    ).first()
+    ))
     if review_report is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -584,13 +623,13 @@ async def report_review(
         user_uid=uid
     )
     db.add(review_report)
-    db.commit()
+    await db.commit()
 
-    report_count = db.query(func.count(ReviewReportModel.id)).filter(
+    report_count = await db.scalar(select(func.count(ReviewReportModel.id)).where(
         ReviewReportModel.review_id == review_id,
         ReviewReportModel.user_uid == uid
-    ).scalar()
+    ))
     print(report_count)
     if report_count >= 10:
         review.is_reported = 1
-        db.commit()
+        await db.commit()
@@ -0,0 +1,46 @@
+import os
+from typing import Dict, Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from core.auth import verify_user_token
+from core.config import settings
+from database.mariadb_session import pool_stats, async_pool_stats, replica_router
+
+router = APIRouter()
+
+@router.get("/status/db-pool", status_code=status.HTTP_200_OK)
+async def get_db_pool_status(
+        user_data: Optional[Dict[str, Any]] = Depends(verify_user_token)
+):
+    if user_data is None or not user_data.get("level"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin privileges required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 요청을 받은 워커 하나의 통계, 워커 수만큼 곱해서 전체 커넥션 수를 가늠한다 (레플리카는 레플리카마다 따로)
+    per_engine = settings.MARIADB_POOL_SIZE + settings.MARIADB_MAX_OVERFLOW
+    return {
+        "pid": os.getpid(),
+        "config": {
+            "pool_size": settings.MARIADB_POOL_SIZE,
+            "max_overflow": settings.MARIADB_MAX_OVERFLOW,
+            "pool_timeout": settings.MARIADB_POOL_TIMEOUT,
+            "pool_recycle": settings.MARIADB_POOL_RECYCLE,
+            "pool_pre_ping": settings.MARIADB_POOL_PRE_PING,
+            "workers": settings.GUNICORN_WORKERS,
+            "max_connections_per_worker": per_engine * 2,
+            "max_connections_total": per_engine * 2 * settings.GUNICORN_WORKERS,
+        },
+        "pools": [pool_stats.snapshot(), async_pool_stats.snapshot()],
+        "replicas": [
+            {
+                "host": replica.host,
+                "healthy": replica.healthy,
+                "pools": [replica.pool_stats.snapshot(), replica.async_pool_stats.snapshot()]
+            }
+            for replica in replica_router.replicas
+        ]
+    }
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from starlette import status
 
 from core.auth import verify_user_token
-from database.mariadb_session import get_db
+from database.mariadb_session import get_db, get_read_db
 from models import Term as TermModel
 from schemas import TermCreate, Term
 
@@ -32,7 +32,7 @@ def create_term(
     return db_term
 
 @router.get("/term", response_model=List[Term], status_code=200)
-def get_all_terms(db: Session = Depends(get_db)):
+def get_all_terms(db: Session = Depends(get_read_db)):
     terms = db.query(TermModel).all()
     if not terms:
         raise HTTPException(
@@ -42,7 +42,7 @@ def get_all_terms(db: Session = Depends(get_db)):
     return terms
 
 @router.get("/term/{term_id}", response_model=Term, status_code=200)
-def get_term_by_id(term_id: int, db: Session = Depends(get_db)):
+def get_term_by_id(term_id: int, db: Session = Depends(get_read_db)):
     term = db.query(TermModel).filter(TermModel.id == term_id).first()
     if not term:
         raise HTTPException(
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+# 실행 중인 서버의 드론스팟 목록/상세 엔드포인트에 동시 요청을 보내 처리량과 지연을 잰다
+# 동기 Session 버전(09ab2c2 이전)과 지금 버전을 각각 같은 DB 로 띄워놓고 돌려서 비교한다
+# 사용법: python benchmark/dronespot_api.py [서버 주소] [동시 요청 수] [요청 수]
+#   BENCHMARK_TOKEN 환경변수에 access token 을 넣으면 로그인 유저로 요청 (is_like 조회 포함)
+BASE_URL = sys.argv[1] if len(sys.argv) > 1 else 'http://localhost:8000'
+CONCURRENCY = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+REQUESTS = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+TOKEN = os.environ.get('BENCHMARK_TOKEN')
+
+
+async def run(client: httpx.AsyncClient, name: str, paths):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(REQUESTS):
+        queue.put_nowait(paths[i % len(paths)])
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            path = queue.get_nowait()
+            start = time.perf_counter()
+            res = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if res.status_code != 200:
+                errors += 1
+
+    # 커넥션 워밍업
+    await asyncio.gather(*(client.get(paths[0]) for _ in range(min(CONCURRENCY, 10))))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:>7}: {REQUESTS / elapsed:8.1f} req/s, "
+          f"p50 {statistics.median(latencies) * 1000:7.1f}ms, p95 {p95 * 1000:7.1f}ms, non-200 {errors}")
+
+
+async def main():
+    headers = {'Authorization': f'Bearer {TOKEN}'} if TOKEN else {}
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+    async with httpx.AsyncClient(base_url=f'{BASE_URL}/api/v1', headers=headers, limits=limits, timeout=60) as client:
+        res = await client.get('/dronespot/all')
+        res.raise_for_status()
+        dronespot_ids = [dronespot['id'] for dronespot in res.json()][:100]
+
+        print(f"{BASE_URL}: concurrency={CONCURRENCY}, requests={REQUESTS}, dronespots={len(dronespot_ids)}")
+        await run(client, 'popular', [f'/dronespot/popular?size=10&page_num={page}' for page in range(1, 6)])
+        await run(client, 'all', ['/dronespot/all'])
+        await run(client, 'detail', [f'/dronespot/{dronespot_id}' for dronespot_id in dronespot_ids])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Dict, List, Any
+
+from shapely import Point
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.area_data import get_area_data
+from database.mariadb_session import AsyncSessionLocal
+from models import Area as AreaModel, DronespotArea as DronespotAreaModel, Dronespot as DronespotModel
+
+# 어떤 구역에도 속하지 않는 경우
+NO_AREA = {'id': 9, 'name': '해당없음'}
+
+
+def find_areas(lon: float, lat: float) -> List[Dict[str, Any]]:
+    # 공간 인덱스(STRtree)로 좌표를 포함하는 구역만 조회
+    data = get_area_data()
+    indices = sorted(data.tree.query(Point(lon, lat), predicate='within'))
+
+    area = []
+    seen = set()
+    for i in indices:
+        area_id = data.ids[i]
+        if area_id in seen:
+            continue
+        seen.add(area_id)
+        area.append({
+            'id': area_id,
+            'name': data.names[i]
+        })
+
+    if len(area) == 0:
+        area.append(dict(NO_AREA))
+    return area
+
+
+async def save_dronespot_areas(db: AsyncSession, dronespot: DronespotModel) -> List[Dict[str, Any]]:
+    # 드론스팟 생성/수정 시 구역을 계산해서 dronespot_area 에 저장 (commit 은 호출한 쪽에서)
+    area = find_areas(float(dronespot.lon), float(dronespot.lat))
+
+    await db.execute(delete(DronespotAreaModel).where(
+        DronespotAreaModel.dronespot_id == dronespot.id
+    ).execution_options(synchronize_session=False))
+    # 같은 구역을 동시에 처음 저장해도 PK 충돌이 나지 않도록 upsert
+    area_statement = insert(AreaModel).values([{'id': a['id'], 'name': a['name']} for a in area])
+    await db.execute(area_statement.on_duplicate_key_update(name=area_statement.inserted.name))
+    for a in area:
+        db.add(DronespotAreaModel(dronespot_id=dronespot.id, area_id=a['id']))
+    return area
+
+
+async def get_dronespot_areas(db: AsyncSession, dronespot_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    # 드론스팟 목록의 구역을 한번의 join 으로 조회
+    areas = {dronespot_id: [] for dronespot_id in dronespot_ids}
+    if not areas:
+        return areas
+
+    rows = await db.execute(select(DronespotAreaModel.dronespot_id, AreaModel.id, AreaModel.name).join(
+        AreaModel, AreaModel.id == DronespotAreaModel.area_id
+    ).where(
+        DronespotAreaModel.dronespot_id.in_(list(areas.keys()))
+    ).order_by(DronespotAreaModel.dronespot_id, AreaModel.id))
+    for dronespot_id, area_id, name in rows:
+        areas[dronespot_id].append({'id': area_id, 'name': name})
+
+    return areas
+
+
+async def backfill_dronespot_areas() -> None:
+    async with AsyncSessionLocal() as db:
+        dronespots = (await db.scalars(select(DronespotModel))).all()
+        for dronespot in dronespots:
+            await save_dronespot_areas(db, dronespot)
+            await db.commit()
+        print(f"{len(dronespots)} dronespot areas saved")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_dronespot_areas())
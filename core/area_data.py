@@ -0,0 +1,79 @@
+import json
+import os
+import threading
+from typing import List, Optional
+
+import numpy as np
+import shapely
+
+from core.config import settings
+
+AREA_WKB_PATH = os.path.splitext(settings.AREA_SHP_PATH)[0] + '_wkb.npy'
+AREA_INDEX_PATH = os.path.splitext(settings.AREA_SHP_PATH)[0] + '_index.json'
+
+
+class AreaData:
+    # 구역 폴리곤과 STRtree, 구역 id/이름
+    def __init__(self, geometries: np.ndarray, ids: List[int], names: List[str]):
+        self.geometries = geometries
+        self.ids = ids
+        self.names = names
+        self.tree = shapely.STRtree(geometries)
+
+
+_area_data: Optional[AreaData] = None
+_area_data_lock = threading.Lock()
+
+
+def _load_prebuilt() -> AreaData:
+    # shapefile 을 파싱하지 않고 미리 변환해둔 WKB 만 읽는다 (워커마다 한번)
+    buffer = np.load(AREA_WKB_PATH)
+    with open(AREA_INDEX_PATH, encoding='utf-8') as f:
+        index = json.load(f)
+
+    offsets = index['offsets']
+    wkbs = [buffer[offsets[i]:offsets[i + 1]].tobytes() for i in range(len(offsets) - 1)]
+    return AreaData(shapely.from_wkb(wkbs), index['ids'], index['names'])
+
+
+def _load_shapefile() -> AreaData:
+    import geopandas as gpd
+
+    data = gpd.read_file(settings.AREA_SHP_PATH)
+    return AreaData(
+        data.geometry.values.to_numpy(),
+        [int(v) for v in data['type_int']],
+        [str(v) for v in data['type_str']]
+    )
+
+
+def get_area_data() -> AreaData:
+    # 처음 사용할 때 한번만 읽는다 (geopandas 는 미리 만든 파일이 없을 때만 import)
+    global _area_data
+    if _area_data is None:
+        with _area_data_lock:
+            if _area_data is None:
+                if os.path.exists(AREA_WKB_PATH) and os.path.exists(AREA_INDEX_PATH):
+                    _area_data = _load_prebuilt()
+                else:
+                    _area_data = _load_shapefile()
+    return _area_data
+
+
+def build_area_data() -> None:
+    # areas.shp 를 WKB 버퍼 + 인덱스 파일로 변환
+    data = _load_shapefile()
+    wkbs = shapely.to_wkb(data.geometries)
+
+    offsets = [0]
+    for wkb in wkbs:
+        offsets.append(offsets[-1] + len(wkb))
+
+    np.save(AREA_WKB_PATH, np.frombuffer(b''.join(wkbs), dtype=np.uint8))
+    with open(AREA_INDEX_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'offsets': offsets, 'ids': data.ids, 'names': data.names}, f, ensure_ascii=False)
+    print(f"{len(data.ids)} areas saved to {AREA_WKB_PATH}")
+
+
+if __name__ == "__main__":
+    build_area_data()
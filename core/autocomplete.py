@@ -0,0 +1,140 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.rebuild_journal import RebuildJournal
+
+# 한글 음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+# 겹모음/겹받침은 입력 중간 상태와 맞도록 자판에서 치는 순서대로 나눈다
+JUNGSUNG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅗㅏ', 'ㅗㅐ', 'ㅗㅣ', 'ㅛ', 'ㅜ', 'ㅜㅓ', 'ㅜㅔ', 'ㅜㅣ',
+            'ㅠ', 'ㅡ', 'ㅡㅣ', 'ㅣ']
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄱㅅ', 'ㄴ', 'ㄴㅈ', 'ㄴㅎ', 'ㄷ', 'ㄹ', 'ㄹㄱ', 'ㄹㅁ', 'ㄹㅂ', 'ㄹㅅ', 'ㄹㅌ', 'ㄹㅍ', 'ㄹㅎ', 'ㅁ',
+            'ㅂ', 'ㅂㅅ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 호환 자모의 겹자음/겹모음 (입력값에 직접 들어오는 경우)
+COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ', 'ㄾ': 'ㄹㅌ',
+    'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ', 'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ',
+    'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+
+
+def decompose(text: str) -> str:
+    # '드론' -> 'ㄷㅡㄹㅗㄴ' (한글 외 글자는 소문자로 그대로)
+    jamo = []
+    for char in text.lower():
+        code = ord(char) - HANGUL_BASE
+        if 0 <= code <= HANGUL_END - HANGUL_BASE:
+            jamo.append(CHOSUNG[code // 588])
+            jamo.append(JUNGSUNG[code % 588 // 28])
+            jamo.append(JONGSUNG[code % 28])
+        else:
+            jamo.append(COMPOUND_JAMO.get(char, char))
+    return ''.join(jamo)
+
+
+def chosung(text: str) -> str:
+    # '드론' -> 'ㄷㄹ'
+    initials = []
+    for char in text.lower():
+        code = ord(char) - HANGUL_BASE
+        initials.append(CHOSUNG[code // 588] if 0 <= code <= HANGUL_END - HANGUL_BASE else char)
+    return ''.join(initials)
+
+
+def index_keys(name: str) -> Set[str]:
+    # 이름 전체와 띄어쓰기 뒤 각 단어부터의 자모열 / 초성열
+    words = name.split()
+    keys = set()
+    for i in range(len(words)):
+        suffix = ' '.join(words[i:])
+        keys.add(decompose(suffix))
+        keys.add(chosung(suffix))
+    return keys
+
+
+class _Node:
+    __slots__ = ('children', 'ids')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        # 이 노드를 접두사로 갖는 드론스팟 id
+        self.ids: Set[int] = set()
+
+
+class DronespotAutocomplete(RebuildJournal):
+    # 드론스팟 이름의 자모/초성 trie (음절 접두사는 자모로 풀어서 같은 trie 에서 찾는다)
+    def __init__(self):
+        self.ready = False
+        self._root = _Node()
+        self._names: Dict[int, str] = {}
+
+    def _insert(self, root: _Node, dronespot_id: int, name: str) -> None:
+        for key in index_keys(name):
+            node = root
+            for char in key:
+                node = node.children.setdefault(char, _Node())
+                node.ids.add(dronespot_id)
+
+    def build(self, rows: Iterable[Tuple[int, str]]) -> None:
+        root = _Node()
+        names: Dict[int, str] = {}
+        for dronespot_id, name in rows:
+            names[dronespot_id] = name
+            self._insert(root, dronespot_id, name)
+
+        self._root = root
+        self._names = names
+        self.ready = True
+        self._replay()
+
+    def add(self, dronespot_id: int, name: str) -> None:
+        self.remove(dronespot_id)
+        self._names[dronespot_id] = name
+        self._insert(self._root, dronespot_id, name)
+        self._record('add', dronespot_id, name)
+
+    def remove(self, dronespot_id: int) -> None:
+        self._record('remove', dronespot_id)
+        name = self._names.pop(dronespot_id, None)
+        if name is None:
+            return
+        for key in index_keys(name):
+            node = self._root
+            path = []
+            for char in key:
+                child = node.children.get(char)
+                if child is None:
+                    break
+                child.ids.discard(dronespot_id)
+                path.append((node, char, child))
+                node = child
+            # 비어버린 가지는 잘라낸다
+            for parent, char, child in reversed(path):
+                if child.ids:
+                    break
+                del parent.children[char]
+
+    def _find(self, keyword: str) -> Optional[_Node]:
+        node = self._root
+        for char in keyword:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def search(self, keyword: str, limit: int) -> List[Tuple[int, str]]:
+        # 접두사로 시작하는 드론스팟 (짧은 이름, 이름순으로 limit 개)
+        keyword = decompose(keyword.strip())
+        if not keyword:
+            return []
+        node = self._find(keyword)
+        if node is None:
+            return []
+
+        ids = heapq.nsmallest(limit, node.ids, key=lambda dronespot_id: (len(self._names[dronespot_id]), self._names[dronespot_id], dronespot_id))
+        return [(dronespot_id, self._names[dronespot_id]) for dronespot_id in ids]
+
+
+autocomplete = DronespotAutocomplete()
@@ -1,5 +1,4 @@
 from pydantic_settings import BaseSettings
-import geopandas as gpd
 import os
 from dotenv import load_dotenv
 
@@ -20,6 +19,23 @@ class Settings(BaseSettings):
 
     MARIADB_URL: str = (f'mariadb+pymysql://{MARIADB_USERNAME}:{MARIADB_PASSWORD}@{MARIADB_HOST}:{MARIADB_PORT}'
                         f'/{MARIADB_DATABASE}?charset=utf8mb4')
+    MARIADB_ASYNC_URL: str = (f'mariadb+aiomysql://{MARIADB_USERNAME}:{MARIADB_PASSWORD}@{MARIADB_HOST}:{MARIADB_PORT}'
+                              f'/{MARIADB_DATABASE}?charset=utf8mb4')
+
+    # 커넥션 풀 (워커 프로세스마다, 엔진마다 따로 잡힌다)
+    # 워커당 최대 커넥션 = POOL_SIZE + MAX_OVERFLOW 이고, 동기/비동기 엔진 두 개 * GUNICORN_WORKERS 배가
+    # MariaDB max_connections 를 넘지 않도록 잡는다
+    MARIADB_POOL_SIZE: int = 5
+    MARIADB_MAX_OVERFLOW: int = 10
+    MARIADB_POOL_TIMEOUT: int = 30
+    # MariaDB wait_timeout(기본 8시간) 보다 짧게 잡아서 끊긴 커넥션을 재사용하지 않도록
+    MARIADB_POOL_RECYCLE: int = 60 * 60
+    MARIADB_POOL_PRE_PING: bool = True
+    GUNICORN_WORKERS: int = 2
+
+    # 읽기 전용 레플리카 "host:port,host:port" (계정/DB 는 primary 와 동일, 비어 있으면 모든 읽기를 primary 로)
+    MARIADB_REPLICA_HOSTS: str = os.getenv('MARIADB_REPLICA_HOSTS', '')
+    MARIADB_REPLICA_HEALTH_CHECK_SECONDS: int = 30
 
     ACCESS_TOKEN_ENCODE_ALGORITHM: str = os.getenv('ACCESS_TOKEN_ENCODE_ALGORITHM')
     ACCESS_SECRET_KEY: str = os.getenv('ACCESS_SECRET_KEY')
@@ -31,10 +47,42 @@ class Settings(BaseSettings):
 
     PASSWORD_SALT: str = os.getenv('PASSWORD_SALT')
 
+    # 외부 API(공공데이터포털) 공용 httpx 클라이언트
+    UPSTREAM_CONNECT_TIMEOUT: float = 5.0
+    UPSTREAM_READ_TIMEOUT: float = 10.0
+    UPSTREAM_MAX_CONNECTIONS_PER_HOST: int = 20
+    UPSTREAM_KEEPALIVE_EXPIRY: float = 30.0
+    UPSTREAM_HTTP2: bool = True
+
     TOURAPI_LDM_KEY: str = os.getenv('TOURAPI_LDM_KEY')
+    # TourAPI 동시 요청 수 (검색 페이지, 장소 이미지)
+    TOURAPI_CONCURRENCY: int = 8
     WHETHER_API_KEY: str = os.getenv('WHETHER_API_KEY')
+    WHETHER_PREFETCH_CONCURRENCY: int = 8
+
+    AREA_SHP_PATH: str = os.getenv('AREA_SHP_PATH', './data/areas.shp')
+
+    # 주변장소 저장 작업 큐: 폴링 주기, 한번에 가져올 작업 수, 재시도 횟수/간격, 실행 중 멈춤 판단 시간
+    ENRICHMENT_POLL_SECONDS: int = 10
+    ENRICHMENT_BATCH_SIZE: int = 5
+    ENRICHMENT_MAX_ATTEMPTS: int = 5
+    ENRICHMENT_BASE_BACKOFF_MINUTES: int = 1
+    ENRICHMENT_MAX_BACKOFF_MINUTES: int = 60
+    ENRICHMENT_STALE_MINUTES: int = 30
+
+    # 자동완성 최대 개수
+    AUTOCOMPLETE_MAX_SIZE: int = 20
+
+    # 검색 트렌드 카운트를 DB 에 반영하는 주기
+    TREND_FLUSH_SECONDS: int = 5
+    # 인기 드론스팟: 최근 몇 시간의 버킷을 볼지, 점수가 절반이 되는 시간, 순위 갱신 주기
+    TRENDING_WINDOW_HOURS: int = 24 * 7
+    TRENDING_HALF_LIFE_HOURS: float = 24
+    TRENDING_REFRESH_MINUTES: int = 5
 
-    AREA_SHP_DATA: gpd.GeoDataFrame = gpd.read_file('./data/areas.shp')
+    # 개인화 추천: 유저별로 미리 계산해 둘 추천 개수, 리뷰를 좋아요 대비 얼마로 칠지
+    RECOMMEND_TOP_N: int = 100
+    RECOMMEND_REVIEW_WEIGHT: float = 0.5
 
     class Config:
         case_sensitive = True
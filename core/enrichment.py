@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.getplace import save_place
+from models import EnrichmentJob
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+async def enqueue_enrichment(db: AsyncSession, dronespot_id: int) -> EnrichmentJob:
+    # 같은 드론스팟의 작업이 이미 대기 중이면 새로 넣지 않는다
+    # 실행 중인 작업은 이미 예전 위치를 읽었을 수 있으므로 위치가 바뀌면 새 작업을 넣는다
+    job = await db.scalar(select(EnrichmentJob).where(
+        EnrichmentJob.dronespot_id == dronespot_id,
+        EnrichmentJob.status == PENDING
+    ))
+    if job is None:
+        job = EnrichmentJob(dronespot_id=dronespot_id, status=PENDING, attempts=0, next_run_at=datetime.utcnow())
+        db.add(job)
+        await db.commit()
+    return job
+
+
+async def get_latest_enrichment(db: AsyncSession, dronespot_id: int) -> Optional[EnrichmentJob]:
+    return await db.scalar(
+        select(EnrichmentJob)
+        .where(EnrichmentJob.dronespot_id == dronespot_id)
+        .order_by(EnrichmentJob.id.desc())
+        .limit(1)
+    )
+
+
+async def claim_enrichment_jobs(db: AsyncSession, limit: int) -> List[int]:
+    # 실행할 때가 된 작업과, 실행 중에 워커가 죽어 오래 멈춘 작업을 가져온다
+    # 워커가 여러 개라도 같은 작업을 잡지 않도록 SKIP LOCKED
+    # 같은 드론스팟의 이전 작업이 아직 실행 중이면 대기 작업은 그 작업이 끝난 뒤에 가져온다
+    # (예전 위치로 저장하는 작업이 나중에 끝나 새 위치의 결과를 덮어쓰지 않도록)
+    now = datetime.utcnow()
+    stale = now - timedelta(minutes=settings.ENRICHMENT_STALE_MINUTES)
+    running = aliased(EnrichmentJob)
+    jobs = (await db.scalars(
+        select(EnrichmentJob)
+        .where(or_(
+            and_(
+                EnrichmentJob.status == PENDING,
+                EnrichmentJob.next_run_at <= now,
+                ~select(running.id).where(
+                    running.dronespot_id == EnrichmentJob.dronespot_id,
+                    running.status == RUNNING,
+                    running.updated_at >= stale
+                ).exists()
+            ),
+            and_(EnrichmentJob.status == RUNNING, EnrichmentJob.updated_at < stale)
+        ))
+        .order_by(EnrichmentJob.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )).all()
+
+    for job in jobs:
+        job.status = RUNNING
+        job.updated_at = now
+    await db.commit()
+    return [job.id for job in jobs]
+
+
+def backoff(attempts: int) -> timedelta:
+    # 1분, 2분, 4분, ... 최대 ENRICHMENT_MAX_BACKOFF_MINUTES
+    minutes = min(settings.ENRICHMENT_BASE_BACKOFF_MINUTES * 2 ** (attempts - 1), settings.ENRICHMENT_MAX_BACKOFF_MINUTES)
+    return timedelta(minutes=minutes)
+
+
+async def run_enrichment_job(db: AsyncSession, job_id: int) -> None:
+    job = await db.get(EnrichmentJob, job_id)
+    if job is None:
+        return
+    # TourAPI 호출 동안 커넥션을 잡고 있지 않도록 트랜잭션을 먼저 끝낸다
+    await db.commit()
+
+    try:
+        await save_place(job.dronespot_id)
+    except Exception as e:
+        job.attempts += 1
+        job.last_error = f"{type(e).__name__}: {e}"[:1000]
+        if job.attempts >= settings.ENRICHMENT_MAX_ATTEMPTS:
+            job.status = FAILED
+        else:
+            job.status = PENDING
+            job.next_run_at = datetime.utcnow() + backoff(job.attempts)
+        print(f"DroneSpot ID {job.dronespot_id}: 주변장소 저장 실패 ({job.attempts}회) {job.last_error}")
+    else:
+        job.attempts += 1
+        job.status = DONE
+        job.last_error = None
+    await db.commit()
@@ -6,9 +6,17 @@ from pydantic import BaseModel
 from typing import Dict, Any
 
 from models import Dronespot as DronespotModel, Place as PlaceModel, DronePlace as DronePlaceModel
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.mysql import insert
 from core.config import settings
-from database.mariadb_session import get_db, SessionLocal
+from database.mariadb_session import AsyncSessionLocal
+from core.http_client import get_http_client
+from core.singleflight import SingleFlight
+from core.sampler import sampler, place_key
+
+_place_flight = SingleFlight()
+# TourAPI 동시 요청 수 제한 (검색 페이지, 이미지 조회 공통)
+_tourapi_semaphore = asyncio.Semaphore(settings.TOURAPI_CONCURRENCY)
 
 class APIRequestParams(BaseModel):
     numOfRows: int
@@ -33,10 +41,6 @@ class APIRequestParamsImg(BaseModel):
     serviceKey: str
 
 
-def is_place_exists(db: Session, content_id: str) -> bool:
-    return db.query(PlaceModel).filter(PlaceModel.type == content_id).first() is not None
-
-
 async def fetch_page(params: APIRequestParams) -> Dict[str, Any]:
     url = (
         "https://apis.data.go.kr/B551011/KorService1/locationBasedList1"
@@ -52,8 +56,8 @@ async def fetch_page(params: APIRequestParams) -> Dict[str, Any]:
     )
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
+        async with _tourapi_semaphore:
+            response = await get_http_client().get(url)
             response.raise_for_status()
             xml_content = response.text
             parsed_data = xmltodict.parse(xml_content)
@@ -80,23 +84,32 @@ async def getplace(mapX: float, mapY: float, contentTypeId: int) -> Dict[int, An
         serviceKey=settings.TOURAPI_LDM_KEY
     )
 
-    all_data = []
-    page_limit = 1
-    while params.pageNo <= page_limit:
-        data = await fetch_page(params)
+    # 첫 페이지로 전체 개수를 알아낸 뒤 나머지 페이지는 동시에 받는다
+    data = await fetch_page(params)
+    if 'error' in data:
+        return {"message": "Failed to fetch data", "data": data}
+
+    body = data.get('response', {}).get('body', {})
+    total_count = int(body.get('totalCount', 0))
+    page_limit = (total_count + params.numOfRows - 1) // params.numOfRows
 
+    pages = [data]
+    pages += await asyncio.gather(*(
+        fetch_page(params.model_copy(update={"pageNo": page_no}))
+        for page_no in range(2, page_limit + 1)
+    ))
+
+    all_data = []
+    for data in pages:
         if 'error' in data:
             return {"message": "Failed to fetch data", "data": data}
 
-        response = data.get('response', {})
-        body = response.get('body', {})
-
-        total_count = int(body.get('totalCount', 0))
+        body = data.get('response', {}).get('body', {})
         items = body.get('items', {}).get('item', [])
-
+        # 한 건이면 리스트가 아니라 딕셔너리로 온다
+        if isinstance(items, dict):
+            items = [items]
         all_data.extend(items)
-        params.pageNo += 1
-        page_limit = (total_count + params.numOfRows - 1) // params.numOfRows
 
     extracted_data = {}
     index = 0
@@ -130,8 +143,8 @@ async def fetch_page_imag(params: APIRequestParamsImg) -> Dict[str, Any]:
     )
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
+        async with _tourapi_semaphore:
+            response = await get_http_client().get(url)
             response.raise_for_status()
             xml_content = response.text
             parsed_data = xmltodict.parse(xml_content)
@@ -146,6 +159,11 @@ async def fetch_page_imag(params: APIRequestParamsImg) -> Dict[str, Any]:
 
 
 async def getplace_img(contentId: str) -> Dict[int, Any]:
+    # 여러 드론스팟이 같은 장소를 동시에 조회해도 이미지 요청은 한번만
+    return await _place_flight.do(('image', contentId), lambda: load_place_img(contentId))
+
+
+async def load_place_img(contentId: str) -> Dict[int, Any]:
     params = APIRequestParamsImg(
         numOfRows=200,
         pageNo=1,
@@ -235,9 +253,13 @@ async def getplace_img(contentId: str) -> Dict[int, Any]:
 
 
 async def save_place(spot_id: int):
-    db: Session = SessionLocal()
-    try:
-        spot = db.query(DronespotModel).filter(DronespotModel.id == spot_id).first()
+    # 같은 드론스팟의 주변장소 저장이 겹쳐 중복 저장되지 않도록 한번만 실행
+    return await _place_flight.do(('spot', spot_id), lambda: load_place(spot_id))
+
+
+async def load_place(spot_id: int):
+    async with AsyncSessionLocal() as db:
+        spot = await db.scalar(select(DronespotModel).where(DronespotModel.id == spot_id))
 
         # # 이미 이 드론스팟에 대한 장소가 저장되어 있는지 확인
         # existing_places = db.query(DronePlaceModel).filter(DronePlaceModel.dronespot_id == spot_id).first()
@@ -253,111 +275,88 @@ async def save_place(spot_id: int):
         #     #         print(f"DroneSpot ID {spot_id}: 이미 장소가 저장되어 있습니다. 건너뜁니다.")
         #     #         continue
 
-        mapX = spot.lon
-        mapY = spot.lat
-        result_res = await getplace(mapX, mapY, 39)  # 비동기 함수 호출
-        # print(result_res)
-        result_accom = await getplace(mapX, mapY, 32)  # 비동기 함수 호출
-
-        for index in range(1, len(result_res) + 1):
-            content_id = result_res[index]['contentid']
-            # print("식당:", content_id)
-
-            # 이미 있는 장소 건너뛰기
-            if is_place_exists(db, content_id):
-                db_place = db.query(PlaceModel).filter(PlaceModel.type == content_id).first()
-                db_droneplace = db.query(DronePlaceModel).filter(
-                    DronePlaceModel.dronespot_id == spot_id,
-                    DronePlaceModel.place_id == db_place.id
-                ).first()
-                if not db_droneplace:
-                    drone_place_data = DronePlaceModel(
-                        dronespot_id=spot_id,
-                        place_id=db_place.id
-                    )
-                    # print(drone_place_data)
-                    db.add(drone_place_data)
-                    db.commit()
-                continue
-
-            image_res = await getplace_img(content_id)
-            photo_url = "None"
-            if image_res:
-                photo_url = image_res[1]['originimgurl']
-            place_data = PlaceModel(
-                name=result_res[index]['title'],
-                type=result_res[index]['contentid'],
-                lat=result_res[index]['mapy'],
-                lon=result_res[index]['mapx'],
-                address=result_res[index]['addr1'],
-                place_type_id=result_res[index]['contenttypeid'],
-                photo_url=photo_url
-            )
-
-            db.add(place_data)
-            db.commit()
-            db.refresh(place_data)
-
-            # drone_place 테이블에 추가
-            drone_place_data = DronePlaceModel(
-                dronespot_id=spot_id,
-                place_id=place_data.id
-            )
-
-            db.add(drone_place_data)
-            db.commit()
-
-        for index in range(1, len(result_accom) + 1):
-            content_id = result_accom[index]['contentid']
-            # print("숙소:", content_id)
-
-            # 이미 있는 장소 건너뛰기
-            if is_place_exists(db, content_id):
-                db_place = db.query(PlaceModel).filter(PlaceModel.type == content_id).first()
-                db_droneplace = db.query(DronePlaceModel).filter(
-                    DronePlaceModel.dronespot_id == spot_id,
-                    DronePlaceModel.place_id == db_place.id
-                ).first()
-                if not db_droneplace:
-                    drone_place_data = DronePlaceModel(
-                        dronespot_id=spot_id,
-                        place_id=db_place.id
-                    )
-                    # print(drone_place_data)
-                    db.add(drone_place_data)
-                    db.commit()
-                continue
-
-            image_accom = await getplace_img(content_id)
-            photo_url = "None"
-            if image_accom:
-                photo_url = image_accom[1]['originimgurl']
-            place_data = PlaceModel(
-                name=result_accom[index]['title'],
-                type=result_accom[index]['contentid'],
-                lat=result_accom[index]['mapy'],
-                lon=result_accom[index]['mapx'],
-                address=result_accom[index]['addr1'],
-                place_type_id=result_accom[index]['contenttypeid'],
-                photo_url=photo_url
-            )
-
-            db.add(place_data)
-            db.commit()
-            db.refresh(place_data)
-
-            # drone_place 테이블에 추가
-            drone_place_data = DronePlaceModel(
-                dronespot_id=spot_id,
-                place_id=place_data.id
-            )
-
-            db.add(drone_place_data)
-            db.commit()
-
-        print(f"DroneSpot ID {spot_id}: 장소 저장 완료.")
-    finally:
-        db.close()
+    # 작업이 대기하는 동안 드론스팟이 삭제됐으면 할 일이 없다
+    if spot is None:
+        print(f"DroneSpot ID {spot_id}: 삭제된 드론스팟이라 건너뜁니다.")
+        return
+
+    mapX = spot.lon
+    mapY = spot.lat
+    # 식당(39), 숙소(32) 검색을 동시에
+    result_res, result_accom = await asyncio.gather(getplace(mapX, mapY, 39), getplace(mapX, mapY, 32))
+    # 조회 실패는 작업 큐에서 재시도하도록 예외로 올린다
+    for result in (result_res, result_accom):
+        if "message" in result:
+            raise RuntimeError(f"{result['message']}: {result['data']}")
+
+    places = {}
+    for result in (result_res, result_accom):
+        for index in range(1, len(result) + 1):
+            places.setdefault(int(result[index]['contentid']), result[index])
+
+    async with AsyncSessionLocal() as db:
+        # 이미 있는 장소는 contentid IN 한번으로 확인
+        existing = set()
+        if places:
+            existing = set((await db.scalars(select(PlaceModel.type).where(PlaceModel.type.in_(list(places))))).all())
+        # 외부 API 호출 동안 커넥션을 잡고 있지 않도록 트랜잭션을 끝낸다
+        await db.commit()
+
+        # 새 장소의 이미지는 동시에 조회 (동시 요청 수는 세마포어로 제한)
+        new_ids = [content_id for content_id in places if content_id not in existing]
+        images = await asyncio.gather(*(getplace_img(str(content_id)) for content_id in new_ids))
+
+        # 새 장소와 drone_place 연결을 다중 행 insert 로 한 트랜잭션에 저장
+        # (다른 워커가 먼저 넣은 행은 unique 인덱스에 걸려 그대로 둔다)
+        if new_ids:
+            place_rows = []
+            for content_id, image_res in zip(new_ids, images):
+                place = places[content_id]
+                # 이미지 조회가 실패하면({"message": ...}) 이 장소만 사진 없이 저장
+                photo_url = "None"
+                first_image = image_res.get(1) if image_res else None
+                if first_image:
+                    photo_url = first_image['originimgurl']
+                place_rows.append({
+                    "name": place['title'],
+                    "type": content_id,
+                    "lat": place['mapy'],
+                    "lon": place['mapx'],
+                    "address": place['addr1'],
+                    "place_type_id": place['contenttypeid'],
+                    "photo_url": photo_url
+                })
+            place_statement = insert(PlaceModel).values(place_rows)
+            await db.execute(place_statement.on_duplicate_key_update(type=place_statement.inserted.type))
+
+        place_ids = []
+        if places:
+            place_ids = (await db.execute(
+                select(PlaceModel.id, PlaceModel.place_type_id).where(PlaceModel.type.in_(list(places)))
+            )).all()
+
+        # 위치가 바뀐 경우 예전 위치의 주변장소 연결은 지우고 새 연결로 교체
+        old_place_type_ids = set((await db.scalars(
+            select(PlaceModel.place_type_id).distinct()
+            .join(DronePlaceModel, DronePlaceModel.place_id == PlaceModel.id)
+            .where(DronePlaceModel.dronespot_id == spot_id)
+        )).all())
+        await db.execute(delete(DronePlaceModel).where(DronePlaceModel.dronespot_id == spot_id))
+        if place_ids:
+            link_statement = insert(DronePlaceModel).values([
+                {"dronespot_id": spot_id, "place_id": place_id}
+                for place_id, _ in place_ids
+            ])
+            await db.execute(link_statement.on_duplicate_key_update(place_id=link_statement.inserted.place_id))
+        await db.commit()
+
+    place_ids_by_type = {place_type_id: [] for place_type_id in old_place_type_ids}
+    for place_id, place_type_id in place_ids:
+        place_ids_by_type.setdefault(place_type_id, []).append(place_id)
+    for place_type_id, type_place_ids in place_ids_by_type.items():
+        sampler.replace(place_key(spot_id, place_type_id), type_place_ids)
+
+    print(f"DroneSpot ID {spot_id}: 장소 저장 완료. (새 장소 {len(new_ids)}, 연결 {len(place_ids)})")
 
 # if __name__ == "__main__":
 #     asyncio.run(save_place(42))
@@ -1,13 +1,15 @@
 import json
 
-import httpx
-
 from pydantic import BaseModel
 from models import (
     Whether
 )
-from sqlalchemy.orm import Session
-from database.mariadb_session import SessionLocal
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.mariadb_session import AsyncSessionLocal
+from core.http_client import get_http_client
+from core.singleflight import SingleFlight
 
 from datetime import datetime, timedelta
 from typing import (
@@ -28,19 +30,29 @@ class APIRequestParams(BaseModel):
     dataType: str
 
 
-def is_whether_valid(db: Session, dronespot_id: int) -> Tuple[bool, Union[None, Whether]]:
-    data = db.query(Whether).filter(Whether.dronespot_id == dronespot_id).first()
-    if data is None:
-        return False, None
+_whether_flight = SingleFlight()
 
-    now = datetime.utcnow() + timedelta(hours=9)
+# (nx, ny, base_time) -> 날씨 데이터, 발표 시각이 바뀌면 키가 달라지므로 자연스럽게 만료
+_whether_cache: Dict[Tuple[int, int, datetime], Dict[str, int]] = {}
+
+
+def get_cached_whether(nx: int, ny: int, broadcast_time: datetime) -> Union[None, Dict[str, int]]:
+    return _whether_cache.get((nx, ny, broadcast_time))
 
-    created_at = data.created_at
-    time_difference = now - created_at
 
-    if time_difference >= timedelta(hours=3):
-        return False, data
-    return True, data
+def set_cached_whether(nx: int, ny: int, broadcast_time: datetime, data: Dict[str, int]) -> None:
+    # 지난 발표 시각의 캐시는 정리
+    for key in [key for key in _whether_cache if key[2] < broadcast_time]:
+        _whether_cache.pop(key, None)
+    _whether_cache[(nx, ny, broadcast_time)] = data
+
+
+async def get_stored_whether(db: AsyncSession, nx: int, ny: int, broadcast_time: datetime) -> Union[None, Whether]:
+    return await db.scalar(select(Whether).where(
+        Whether.nx == nx,
+        Whether.ny == ny,
+        Whether.base_time == broadcast_time
+    ))
 
 
 def get_latest_time():
@@ -77,69 +89,105 @@ async def fetch_whether(params: APIRequestParams) -> Any:
     )
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            if response.status_code != 200:
-                print(response.status_code, response.text)
-                return None
-            data = response.text
-            return json.loads(data)
+        response = await get_http_client().get(url)
+        if response.status_code != 200:
+            print(response.status_code, response.text)
+            return None
+        data = response.text
+        return json.loads(data)
     except Exception as e:
         return None
 
 
 async def get_whether_data(
-    dronespot_id: int,
     nx: int,
     ny: int,
 ):
-    db: Session = SessionLocal()
-
-    valid_data = is_whether_valid(db, dronespot_id)
-    whether_data = valid_data[1]
-    if not valid_data[0]:
-        broadcast_time = get_latest_time()
-        response_data = await fetch_whether(
-            APIRequestParams(
-                serviceKey=settings.WHETHER_API_KEY,
-                nx=nx,
-                ny=ny,
-                base_date=broadcast_time.strftime('%Y%m%d'),
-                base_time=broadcast_time.strftime('%H0000'),
-                dataType='json'
-            )
-        )
+    broadcast_time = get_latest_time()
+
+    cached = get_cached_whether(nx, ny, broadcast_time)
+    if cached is not None:
+        return cached
+
+    # 같은 격자의 예보를 동시에 여러 요청이 찾으면 upstream 호출은 한번만
+    return await _whether_flight.do(
+        (nx, ny, broadcast_time),
+        lambda: load_whether_data(nx, ny, broadcast_time)
+    )
 
-        if response_data is None:
-            return None
 
+async def load_whether_data(
+    nx: int,
+    ny: int,
+    broadcast_time: datetime,
+):
+    async with AsyncSessionLocal() as db:
+        whether_data = await get_stored_whether(db, nx, ny, broadcast_time)
         if whether_data is not None:
-            db.delete(whether_data)
-
-        temp = sky = pty = None
-        for data in response_data['response']['body']['items']['item']:
-            if data['category'] == 'TMP':
-                temp = int(float(data['fcstValue']))
-            elif data['category'] == 'SKY':
-                sky = int(data['fcstValue'])
-            elif data['category'] == 'PTY':
-                pty = int(data['fcstValue'])
-
-        if temp is None or sky is None or pty is None:
-            return None
+            result = {
+                'tmp': whether_data.degree,
+                'sky': whether_data.sky,
+                'pty': whether_data.pty
+            }
+            set_cached_whether(nx, ny, broadcast_time, result)
+            return result
+
+    # 기상청 호출 동안 커넥션을 잡고 있지 않도록 조회 세션은 여기서 닫고, 저장은 새 세션으로
+    response_data = await fetch_whether(
+        APIRequestParams(
+            serviceKey=settings.WHETHER_API_KEY,
+            nx=nx,
+            ny=ny,
+            base_date=broadcast_time.strftime('%Y%m%d'),
+            base_time=broadcast_time.strftime('%H0000'),
+            dataType='json'
+        )
+    )
+
+    if response_data is None:
+        return None
 
-        new_whether_data = Whether(
-            dronespot_id=dronespot_id,
-            created_at=broadcast_time,
-            sky=sky,
-            pty=pty,
-            degree=temp
+    temp = sky = pty = None
+    for data in response_data['response']['body']['items']['item']:
+        if data['category'] == 'TMP':
+            temp = int(float(data['fcstValue']))
+        elif data['category'] == 'SKY':
+            sky = int(data['fcstValue'])
+        elif data['category'] == 'PTY':
+            pty = int(data['fcstValue'])
+
+    if temp is None or sky is None or pty is None:
+        return None
+
+    async with AsyncSessionLocal() as db:
+        # 같은 격자의 지난 예보는 삭제
+        await db.execute(delete(Whether).where(
+            Whether.nx == nx,
+            Whether.ny == ny,
+            Whether.base_time < broadcast_time
+        ).execution_options(synchronize_session=False))
+
+        # 다른 워커가 먼저 저장했어도 충돌하지 않도록 upsert
+        await db.execute(
+            insert(Whether).values(
+                nx=nx,
+                ny=ny,
+                base_time=broadcast_time,
+                sky=sky,
+                pty=pty,
+                degree=temp
+            ).on_duplicate_key_update(
+                sky=sky,
+                pty=pty,
+                degree=temp
+            )
         )
-        db.add(new_whether_data)
-        db.commit()
-        whether_data = new_whether_data
-    return {
-        'tmp': whether_data.degree,
-        'sky': whether_data.sky,
-        'pty': whether_data.pty
+        await db.commit()
+
+    result = {
+        'tmp': temp,
+        'sky': sky,
+        'pty': pty
     }
+    set_cached_whether(nx, ny, broadcast_time, result)
+    return result
@@ -0,0 +1,63 @@
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+
+# 호스트별로 커넥션 수를 따로 제한할 외부 API
+UPSTREAM_HOSTS = ['apis.data.go.kr']
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_enabled() -> bool:
+    # h2 패키지(httpx[http2])가 없으면 HTTP/1.1 만 사용
+    if not settings.UPSTREAM_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _create_client() -> httpx.AsyncClient:
+    http2 = _http2_enabled()
+    timeout = httpx.Timeout(settings.UPSTREAM_READ_TIMEOUT, connect=settings.UPSTREAM_CONNECT_TIMEOUT)
+    host_limits = httpx.Limits(
+        max_connections=settings.UPSTREAM_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections=settings.UPSTREAM_MAX_CONNECTIONS_PER_HOST,
+        keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY
+    )
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=timeout,
+        # 등록되지 않은 호스트는 기본 풀 하나를 함께 쓴다
+        limits=host_limits,
+        # 등록된 호스트는 각자 별도 커넥션 풀 (http, https 모두)
+        mounts={
+            f"all://{host}": httpx.AsyncHTTPTransport(http2=http2, limits=host_limits)
+            for host in UPSTREAM_HOSTS
+        }
+    )
+
+
+async def start_http_client() -> None:
+    global _client
+    if _client is None:
+        _client = _create_client()
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    # 앱 밖(스크립트 등)에서 호출돼도 동작하도록 없으면 만든다
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List, Set, Tuple
+
+from core.rebuild_journal import RebuildJournal
+
+
+def normalize(text: str) -> str:
+    # ilike 와 같게 대소문자만 무시
+    return text.lower()
+
+
+def grams(text: str) -> Set[str]:
+    # 한 글자는 그대로, 두 글자 이상은 bigram
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class DronespotNameIndex(RebuildJournal):
+    # 드론스팟 이름의 글자/bigram -> id 집합 역색인 (부분 일치 검색용)
+    def __init__(self):
+        self.ready = False
+        self._postings: Dict[str, Set[int]] = {}
+        self._names: Dict[int, str] = {}
+
+    def _index(self, postings: Dict[str, Set[int]], dronespot_id: int, name: str) -> None:
+        # 한 글자 검색도 되도록 글자 단위도 같이 넣는다
+        for gram in grams(name) | set(name):
+            postings.setdefault(gram, set()).add(dronespot_id)
+
+    def build(self, rows: Iterable[Tuple[int, str]]) -> None:
+        postings: Dict[str, Set[int]] = {}
+        names: Dict[int, str] = {}
+        for dronespot_id, name in rows:
+            names[dronespot_id] = normalize(name)
+            self._index(postings, dronespot_id, names[dronespot_id])
+
+        self._postings = postings
+        self._names = names
+        self.ready = True
+        self._replay()
+
+    def add(self, dronespot_id: int, name: str) -> None:
+        self.remove(dronespot_id)
+        self._names[dronespot_id] = normalize(name)
+        self._index(self._postings, dronespot_id, self._names[dronespot_id])
+        self._record('add', dronespot_id, name)
+
+    def remove(self, dronespot_id: int) -> None:
+        self._record('remove', dronespot_id)
+        name = self._names.pop(dronespot_id, None)
+        if name is None:
+            return
+        for gram in grams(name) | set(name):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(dronespot_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, keyword: str) -> List[int]:
+        # keyword 를 포함하는 드론스팟 id (접두 일치 먼저, 그다음 이름순)
+        keyword = normalize(keyword)
+        keyword_grams = grams(keyword)
+        if not keyword_grams:
+            return []
+
+        # 가장 작은 posting 부터 교집합
+        postings = sorted((self._postings.get(gram, set()) for gram in keyword_grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+
+        # bigram 이 모두 있어도 연속하지 않을 수 있으니 실제 포함 여부로 확인
+        matches = [dronespot_id for dronespot_id in candidates if keyword in self._names[dronespot_id]]
+        matches.sort(key=lambda dronespot_id: (not self._names[dronespot_id].startswith(keyword), self._names[dronespot_id], dronespot_id))
+        return matches
+
+
+name_index = DronespotNameIndex()
@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, or_, Select
+from sqlalchemy.sql.elements import ColumnElement
+
+# 다음 페이지 커서는 응답 헤더로 내려준다 (응답 본문은 기존 리스트 그대로)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (정렬 컬럼, 내림차순 여부)
+SortKey = Tuple[ColumnElement, bool]
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _load(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    data = json.dumps([_dump(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> List[Any]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = [_load(value) for value in json.loads(data)]
+    except Exception:
+        values = None
+
+    if not isinstance(values, list) or len(values) != length:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return values
+
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement:
+    # (a, b) 다음 행: a 가 더 뒤이거나, a 가 같고 b 가 더 뒤인 행
+    conditions = []
+    for i, (column, descending) in enumerate(keys):
+        equals = [keys[j][0] == values[j] for j in range(i)]
+        after = column < values[i] if descending else column > values[i]
+        conditions.append(and_(*equals, after))
+    return or_(*conditions)
+
+
+def paginate(query: Select, keys: Sequence[SortKey], cursor: Optional[str], page_num: int, size: int) -> Select:
+    # cursor 가 있으면 keyset, 없으면 기존 page_num(offset) 방식
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in keys])
+    if cursor:
+        query = query.where(keyset_condition(keys, decode_cursor(cursor, len(keys))))
+    else:
+        query = query.offset((page_num - 1) * size)
+    return query.limit(size)
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], size: int, key_values: Callable[[Any], Sequence[Any]]) -> None:
+    # 한 페이지가 꽉 찼을 때만 다음 커서를 내려준다
+    if rows and len(rows) >= size:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(key_values(rows[-1]))
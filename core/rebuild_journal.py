@@ -0,0 +1,22 @@
+from typing import Any, List, Optional, Tuple
+
+
+class RebuildJournal:
+    # 인덱스를 DB 에서 다시 읽는 동안 들어온 add/remove 를 기록해 두었다가 새 인덱스에 다시 적용한다
+    # (조회를 기다리는 사이 같은 워커에서 생성/수정/삭제된 드론스팟이 빠지지 않도록)
+    _journal: Optional[List[Tuple[str, Tuple[Any, ...]]]] = None
+
+    def begin_rebuild(self) -> None:
+        self._journal = []
+
+    def cancel_rebuild(self) -> None:
+        self._journal = None
+
+    def _record(self, method: str, *args: Any) -> None:
+        if self._journal is not None:
+            self._journal.append((method, args))
+
+    def _replay(self) -> None:
+        journal, self._journal = self._journal, None
+        for method, args in journal or ():
+            getattr(self, method)(*args)
@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def build_recommendations(
+    likes: Iterable[Tuple[str, int]],
+    reviews: Iterable[Tuple[str, int]],
+    top_n: int,
+    review_weight: float = 0.5
+) -> Dict[str, np.ndarray]:
+    # (유저 x 드론스팟) 상호작용 행렬 -> 드론스팟끼리 코사인 유사도 -> 유저별 상위 top_n
+    # 요청 경로 밖(스케줄러 스레드)에서만 호출한다
+    interactions: Dict[Tuple[str, int], float] = {}
+    for user_uid, dronespot_id in likes:
+        interactions[(user_uid, dronespot_id)] = 1.0
+    for user_uid, dronespot_id in reviews:
+        # 같은 스팟에 좋아요와 리뷰가 모두 있으면 더 높은 쪽만 (여러 번 리뷰해도 한 번으로)
+        key = (user_uid, dronespot_id)
+        interactions[key] = max(interactions.get(key, 0.0), review_weight)
+
+    if not interactions:
+        return {}
+
+    users = sorted({user_uid for user_uid, _ in interactions})
+    items = np.array(sorted({dronespot_id for _, dronespot_id in interactions}), dtype=np.int64)
+    user_index = {user_uid: i for i, user_uid in enumerate(users)}
+    item_index = {int(dronespot_id): i for i, dronespot_id in enumerate(items)}
+
+    rows = np.fromiter((user_index[user_uid] for user_uid, _ in interactions), dtype=np.int32, count=len(interactions))
+    cols = np.fromiter((item_index[dronespot_id] for _, dronespot_id in interactions), dtype=np.int32, count=len(interactions))
+    weights = np.fromiter(interactions.values(), dtype=np.float32, count=len(interactions))
+    matrix = sparse.csr_matrix((weights, (rows, cols)), shape=(len(users), len(items)))
+
+    # 열(드론스팟) 벡터를 정규화한 뒤 곱하면 코사인 유사도
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=0)).ravel())
+    norms[norms == 0] = 1.0
+    normalized = matrix @ sparse.diags(1.0 / norms)
+    similarity = (normalized.T @ normalized).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+
+    # 유저 점수 = 상호작용한 스팟들과의 유사도 합, 이미 상호작용한 스팟은 제외
+    scores = (matrix @ similarity).tocsr()
+    scores = scores - scores.multiply(matrix > 0)
+    scores.eliminate_zeros()
+
+    user_top: Dict[str, np.ndarray] = {}
+    for i, user_uid in enumerate(users):
+        start, end = scores.indptr[i], scores.indptr[i + 1]
+        if start == end:
+            continue
+        row_scores = scores.data[start:end]
+        row_items = scores.indices[start:end]
+        if len(row_scores) > top_n:
+            part = np.argpartition(-row_scores, top_n - 1)[:top_n]
+            row_scores, row_items = row_scores[part], row_items[part]
+        # 점수 내림차순, 같으면 id 오름차순
+        order = np.lexsort((items[row_items], -row_scores))
+        user_top[user_uid] = items[row_items[order]]
+
+    return user_top
+
+
+class DronespotRecommender:
+    # 스케줄러가 계산한 유저별 추천 드론스팟 id 목록을 들고 있다가 페이지 단위로 잘라준다
+    def __init__(self):
+        self.ready = False
+        self._user_top: Dict[str, np.ndarray] = {}
+
+    def replace(self, user_top: Dict[str, np.ndarray]) -> None:
+        # 통째로 교체해서 계산 도중의 목록이 보이지 않게 한다
+        self._user_top = user_top
+        self.ready = True
+
+    def count(self, user_uid: str) -> int:
+        return len(self._user_top.get(user_uid, ()))
+
+    def recommend(self, user_uid: str, start: int, end: int) -> Optional[List[int]]:
+        # 추천 목록이 없는 유저(콜드 스타트)는 None
+        top = self._user_top.get(user_uid)
+        if top is None:
+            return None
+        return top[start:end].tolist()
+
+    def dronespot_ids(self, user_uid: str) -> List[int]:
+        return self._user_top.get(user_uid, np.empty(0, dtype=np.int64)).tolist()
+
+
+recommender = DronespotRecommender()
@@ -0,0 +1,108 @@
+import bisect
+import random
+from array import array
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 카테고리 키
+DRONESPOT = 'dronespot'
+REVIEW = 'review'
+COURSE = 'course'
+
+
+def place_key(dronespot_id: int, place_type_id: int) -> Tuple[str, int, int]:
+    # 드론스팟 주변 장소 (32: 숙소, 39: 식당)
+    return 'place', dronespot_id, place_type_id
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(x: int) -> int:
+    # splitmix64
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _seeded_page(values: array, seed: int, start: int, end: int) -> List[int]:
+    # id 마다 seed 와 섞은 64bit 해시를 붙이고 해시 순으로 늘어놓은 순서의 [start, end) 구간
+    # splitmix64 는 전단사라 해시가 겹치지 않고, 앞쪽 end 개만 골라서 정렬한다
+    ids = np.frombuffer(values.tobytes(), dtype=np.int64)
+    keys = ids.astype(np.uint64) ^ np.uint64(_mix(seed & _MASK64))
+    keys = keys + np.uint64(0x9E3779B97F4A7C15)
+    keys = (keys ^ (keys >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    keys = (keys ^ (keys >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    keys = keys ^ (keys >> np.uint64(31))
+
+    top = np.argpartition(keys, end - 1)[:end] if end < len(ids) else np.arange(len(ids))
+    top = top[np.argsort(keys[top])]
+    return ids[top[start:end]].tolist()
+
+
+class RandomSampler:
+    # 카테고리별 정렬된 id 배열(array)을 메모리에 두고 ORDER BY RAND() 없이 무작위로 뽑는다
+    def __init__(self):
+        self.ready = False
+        self._ids: Dict[Hashable, array] = {}
+
+    def build(self, rows: Iterable[Tuple[Hashable, int]]) -> None:
+        ids: Dict[Hashable, List[int]] = {}
+        for key, row_id in rows:
+            ids.setdefault(key, []).append(row_id)
+
+        self._ids = {key: array('q', sorted(values)) for key, values in ids.items()}
+        self.ready = True
+
+    def add(self, key: Hashable, row_id: int) -> None:
+        values = self._ids.setdefault(key, array('q'))
+        i = bisect.bisect_left(values, row_id)
+        if i == len(values) or values[i] != row_id:
+            values.insert(i, row_id)
+
+    def remove(self, key: Hashable, row_id: int) -> None:
+        values = self._ids.get(key)
+        if not values:
+            return
+        i = bisect.bisect_left(values, row_id)
+        if i < len(values) and values[i] == row_id:
+            del values[i]
+
+    def replace(self, key: Hashable, row_ids: Iterable[int]) -> None:
+        # 한 카테고리의 id 목록을 통째로 교체 (빈 목록이면 카테고리 삭제)
+        values = array('q', sorted(set(row_ids)))
+        if values:
+            self._ids[key] = values
+        else:
+            self._ids.pop(key, None)
+
+    def count(self, key: Hashable) -> int:
+        return len(self._ids.get(key, ()))
+
+    def sample(self, key: Hashable, size: int, page_num: int = 1, seed: Optional[int] = None) -> List[int]:
+        # seed 가 없으면 매번 새로 뽑고, 있으면 같은 seed 로 같은 순서를 페이지 단위로 넘겨본다
+        values = self._ids.get(key, ())
+        n = len(values)
+        if n == 0:
+            return []
+
+        if seed is None:
+            return random.sample(values, min(size, n))
+
+        start = (page_num - 1) * size
+        return self.permuted(key, start, start + size, seed)
+
+    def permuted(self, key: Hashable, start: int, end: int, seed: int) -> List[int]:
+        # seed 로 정해진 순서의 [start, end) 구간
+        # id 가 추가/삭제되어도 나머지 id 끼리의 순서는 그대로라, 그 사이에 넘긴 페이지는
+        # 바뀐 위치보다 앞에서 추가/삭제된 id 수만큼만 밀리거나 당겨진다 (그만큼 중복/누락)
+        values = self._ids.get(key, ())
+        end = min(end, len(values))
+        if start >= end:
+            return []
+        return _seeded_page(values, seed, start, end)
+
+
+sampler = RandomSampler()
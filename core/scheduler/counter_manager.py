@@ -0,0 +1,8 @@
+from database.mariadb_session import AsyncSessionLocal
+from crud.crud_dronespot import reconcile_counters
+
+
+async def reconcile_count_columns():
+    async with AsyncSessionLocal() as db:
+        fixed = await reconcile_counters(db)
+        print(f"{fixed} count columns reconciled")
@@ -0,0 +1,12 @@
+from core.config import settings
+from core.enrichment import claim_enrichment_jobs, run_enrichment_job
+from database.mariadb_session import AsyncSessionLocal
+
+
+async def run_enrichment_jobs():
+    async with AsyncSessionLocal() as db:
+        job_ids = await claim_enrichment_jobs(db, settings.ENRICHMENT_BATCH_SIZE)
+
+    for job_id in job_ids:
+        async with AsyncSessionLocal() as db:
+            await run_enrichment_job(db, job_id)
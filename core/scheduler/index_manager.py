@@ -0,0 +1,26 @@
+from sqlalchemy import select
+
+from database.mariadb_session import AsyncSessionLocal
+from models import Dronespot
+from core.autocomplete import autocomplete
+from core.name_index import name_index
+from core.spatial_index import spatial_index
+
+
+async def rebuild_dronespot_index():
+    # 조회 중에 반영된 변경은 기록해 두었다가 build 후 다시 적용
+    indexes = (spatial_index, name_index, autocomplete)
+    for index in indexes:
+        index.begin_rebuild()
+    try:
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(select(Dronespot.id, Dronespot.lat, Dronespot.lon, Dronespot.name))).all()
+    except Exception:
+        for index in indexes:
+            index.cancel_rebuild()
+        raise
+
+    spatial_index.build((dronespot_id, lat, lon) for dronespot_id, lat, lon, _ in rows)
+    name_index.build((dronespot_id, name) for dronespot_id, _, _, name in rows)
+    autocomplete.build((dronespot_id, name) for dronespot_id, _, _, name in rows)
+    print(f"{len(rows)} dronespots indexed")
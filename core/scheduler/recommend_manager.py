@@ -0,0 +1,24 @@
+import asyncio
+
+from sqlalchemy import select
+
+from core.config import settings
+from core.recommend import recommender, build_recommendations
+from database.mariadb_session import AsyncSessionLocal
+from models import UserDronespotLike, Review
+
+
+async def rebuild_recommendations():
+    async with AsyncSessionLocal() as db:
+        likes = (await db.execute(select(UserDronespotLike.user_uid, UserDronespotLike.drone_spot_id))).all()
+        reviews = (await db.execute(
+            select(Review.writer_uid, Review.dronespot_id)
+            .where(Review.writer_uid.is_not(None))
+        )).all()
+
+    # 행렬 계산은 이벤트 루프를 막지 않도록 스레드에서
+    user_top = await asyncio.to_thread(
+        build_recommendations, likes, reviews, settings.RECOMMEND_TOP_N, settings.RECOMMEND_REVIEW_WEIGHT
+    )
+    recommender.replace(user_top)
+    print(f"{len(user_top)} users recommended from {len(likes)} likes, {len(reviews)} reviews")
@@ -1,17 +1,16 @@
-from database.mariadb_session import SessionLocal
+from sqlalchemy import select
+
+from database.mariadb_session import AsyncSessionLocal
 from models import Refresh
 from datetime import datetime
 
 
 async def delete_expired_refresh():
-    db = SessionLocal()
-    try:
-        expired_refresh = db.query(Refresh).filter(
+    async with AsyncSessionLocal() as db:
+        expired_refresh = (await db.scalars(select(Refresh).where(
             Refresh.expired_date < datetime.utcnow()
-        ).all()
+        ))).all()
         for r in expired_refresh:
-            db.delete(r)
-        db.commit()
+            await db.delete(r)
+        await db.commit()
         print(f"{len(expired_refresh)} refresh tokens deleted")
-    finally:
-        db.close()
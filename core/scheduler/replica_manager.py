@@ -0,0 +1,6 @@
+from database.mariadb_session import replica_router
+
+
+async def check_replicas():
+    healthy = await replica_router.check_health()
+    print(f"{healthy}/{len(replica_router.replicas)} replicas healthy")
@@ -0,0 +1,23 @@
+from sqlalchemy import select
+
+from core.sampler import sampler, DRONESPOT, REVIEW, COURSE, place_key
+from database.mariadb_session import AsyncSessionLocal
+from models import Dronespot, Review, Course, Place, DronePlace
+
+
+async def rebuild_samplers():
+    async with AsyncSessionLocal() as db:
+        dronespot_ids = (await db.scalars(select(Dronespot.id))).all()
+        review_ids = (await db.scalars(select(Review.id))).all()
+        course_ids = (await db.scalars(select(Course.id))).all()
+        places = (await db.execute(
+            select(DronePlace.dronespot_id, Place.place_type_id, Place.id)
+            .join(Place, Place.id == DronePlace.place_id)
+        )).all()
+
+    rows = [(DRONESPOT, dronespot_id) for dronespot_id in dronespot_ids]
+    rows += [(REVIEW, review_id) for review_id in review_ids]
+    rows += [(COURSE, course_id) for course_id in course_ids]
+    rows += [(place_key(dronespot_id, place_type_id), place_id) for dronespot_id, place_type_id, place_id in places]
+    sampler.build(rows)
+    print(f"{len(dronespot_ids)} dronespots, {len(review_ids)} reviews, {len(course_ids)} courses, {len(places)} places sampled")
@@ -0,0 +1,16 @@
+from core.config import settings
+from core.trend import trend_counter, rebuild_trending_snapshot
+from database.mariadb_session import AsyncSessionLocal
+
+
+async def flush_trend_counter():
+    if not trend_counter.pending():
+        return
+    async with AsyncSessionLocal() as db:
+        await trend_counter.flush(db)
+
+
+async def rebuild_trending():
+    async with AsyncSessionLocal() as db:
+        ranked = await rebuild_trending_snapshot(db, settings.TRENDING_WINDOW_HOURS, settings.TRENDING_HALF_LIFE_HOURS)
+    print(f"{ranked} trending dronespots ranked")
@@ -0,0 +1,37 @@
+import asyncio
+
+from sqlalchemy import select
+
+from core.config import settings
+from core.coordinate import CoordinateConverter
+from core.getwhether import get_whether_data
+from database.mariadb_session import AsyncSessionLocal, async_engine
+from database.named_lock import named_lock
+from models import Dronespot
+
+
+async def prefetch_whether():
+    # 모든 워커에서 같은 시각에 실행되므로 락을 잡은 워커 하나만 기상청을 호출한다
+    async with named_lock(async_engine, 'prefetch_whether') as acquired:
+        if not acquired:
+            print("whether prefetch is running in another worker")
+            return
+        async with AsyncSessionLocal() as db:
+            locations = (await db.execute(select(Dronespot.lat, Dronespot.lon))).all()
+
+        # 같은 격자에 있는 드론스팟은 한번만 조회
+        converter = CoordinateConverter()
+        cells = {
+            converter.convert(lon=float(lon), lat=float(lat), x=None, y=None, code=0)
+            for lat, lon in locations
+        }
+
+        semaphore = asyncio.Semaphore(settings.WHETHER_PREFETCH_CONCURRENCY)
+
+        async def prefetch(nx: int, ny: int):
+            async with semaphore:
+                return await get_whether_data(nx, ny)
+
+        results = await asyncio.gather(*(prefetch(nx, ny) for nx, ny in cells), return_exceptions=True)
+        fetched = len([r for r in results if r is not None and not isinstance(r, Exception)])
+        print(f"{fetched}/{len(cells)} whether grid cells prefetched")
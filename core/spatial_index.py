@@ -0,0 +1,103 @@
+import math
+from typing import Dict, Iterable, Set, Tuple
+
+from core.rebuild_journal import RebuildJournal
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    # 두 좌표 사이의 대원 거리 (km)
+    d_lat = math.radians(lat2 - lat1)
+    d_lon = math.radians(lon2 - lon1)
+    a = (math.sin(d_lat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius: float) -> Tuple[float, float, float, float]:
+    # 반경 radius(km) 원을 감싸는 위경도 사각형 (min_lat, max_lat, min_lon, max_lon)
+    d_lat = math.degrees(radius / EARTH_RADIUS_KM)
+    min_lat = lat - d_lat
+    max_lat = lat + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    d_lon = math.degrees(math.asin(min(1.0, math.sin(radius / EARTH_RADIUS_KM) / math.cos(math.radians(lat)))))
+    return min_lat, max_lat, lon - d_lon, lon + d_lon
+
+
+class DronespotSpatialIndex(RebuildJournal):
+    # 위경도 격자(cell_size 도 단위) 버킷에 드론스팟 id 를 담아두는 인메모리 인덱스
+    def __init__(self, cell_size: float = 0.1):
+        self.cell_size = cell_size
+        self.ready = False
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def build(self, rows: Iterable[Tuple[int, float, float]]) -> None:
+        cells: Dict[Tuple[int, int], Set[int]] = {}
+        points: Dict[int, Tuple[float, float]] = {}
+        for dronespot_id, lat, lon in rows:
+            points[dronespot_id] = (float(lat), float(lon))
+            cells.setdefault(self._cell(float(lat), float(lon)), set()).add(dronespot_id)
+
+        self._cells = cells
+        self._points = points
+        self.ready = True
+        self._replay()
+
+    def add(self, dronespot_id: int, lat: float, lon: float) -> None:
+        self.remove(dronespot_id)
+        self._points[dronespot_id] = (float(lat), float(lon))
+        self._cells.setdefault(self._cell(float(lat), float(lon)), set()).add(dronespot_id)
+        # add 안에서 호출한 remove 다음에 기록되도록 마지막에
+        self._record('add', dronespot_id, lat, lon)
+
+    def remove(self, dronespot_id: int) -> None:
+        self._record('remove', dronespot_id)
+        point = self._points.pop(dronespot_id, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(dronespot_id)
+            if not bucket:
+                del self._cells[cell]
+
+    def search(self, lat: float, lon: float, radius: float) -> Dict[int, float]:
+        # 반경 radius(km) 안의 드론스팟 {id: 거리}
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius)
+        min_cell = self._cell(min_lat, min_lon)
+        max_cell = self._cell(max_lat, max_lon)
+
+        cell_count = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if cell_count > len(self._cells):
+            cells = [
+                cell for cell in self._cells
+                if min_cell[0] <= cell[0] <= max_cell[0] and min_cell[1] <= cell[1] <= max_cell[1]
+            ]
+        else:
+            cells = [
+                (x, y)
+                for x in range(min_cell[0], max_cell[0] + 1)
+                for y in range(min_cell[1], max_cell[1] + 1)
+            ]
+
+        result = {}
+        for cell in cells:
+            for dronespot_id in self._cells.get(cell, ()):
+                spot_lat, spot_lon = self._points[dronespot_id]
+                if not (min_lat <= spot_lat <= max_lat and min_lon <= spot_lon <= max_lon):
+                    continue
+                distance = haversine(lat, lon, spot_lat, spot_lon)
+                if distance <= radius:
+                    result[dronespot_id] = distance
+        return result
+
+
+spatial_index = DronespotSpatialIndex()
@@ -0,0 +1,122 @@
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.mysql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Dronespot, TrendDronespot, TrendDronespotHourly
+
+
+def hour_bucket(now: datetime) -> datetime:
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+class TrendCounter:
+    # 검색에 걸린 드론스팟 횟수를 (시간 버킷, 드론스팟) 별로 메모리에 모아두었다가 주기적으로 한번에 반영한다
+    def __init__(self):
+        self._counts: Counter = Counter()
+
+    def increment(self, dronespot_ids: Iterable[int]) -> None:
+        bucket = hour_bucket(datetime.utcnow())
+        self._counts.update((bucket, dronespot_id) for dronespot_id in dronespot_ids)
+
+    def pending(self) -> int:
+        return len(self._counts)
+
+    async def flush(self, db: AsyncSession) -> int:
+        # 버퍼를 먼저 비우고(교체) 반영, 실패하면 다음 flush 때 다시 시도하도록 되돌린다
+        counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+
+        # 집계 후 삭제된 드론스팟은 FK 에 걸려 매번 실패하므로 버린다
+        try:
+            existing = set((await db.scalars(
+                select(Dronespot.id).where(Dronespot.id.in_({dronespot_id for _, dronespot_id in counts}))
+            )).all())
+        except Exception:
+            self._counts.update(counts)
+            raise
+        counts = Counter({key: count for key, count in counts.items() if key[1] in existing})
+        if not counts:
+            return 0
+
+        totals: Counter = Counter()
+        for (_, dronespot_id), count in counts.items():
+            totals[dronespot_id] += count
+
+        # 누적 카운트
+        total_statement = insert(TrendDronespot).values([
+            {"dronespot_id": dronespot_id, "count": count}
+            for dronespot_id, count in sorted(totals.items())
+        ])
+        total_statement = total_statement.on_duplicate_key_update(
+            count=TrendDronespot.count + total_statement.inserted.count
+        )
+        # 시간 버킷 카운트
+        hourly_statement = insert(TrendDronespotHourly).values([
+            {"dronespot_id": dronespot_id, "bucket": bucket, "count": count}
+            for (bucket, dronespot_id), count in sorted(counts.items(), key=lambda item: (item[0][1], item[0][0]))
+        ])
+        hourly_statement = hourly_statement.on_duplicate_key_update(
+            count=TrendDronespotHourly.count + hourly_statement.inserted.count
+        )
+        try:
+            await db.execute(total_statement)
+            await db.execute(hourly_statement)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            self._counts.update(counts)
+            raise
+        return len(counts)
+
+
+def decayed_scores(rows: Iterable[Tuple[int, datetime, int]], now: datetime, half_life_hours: float) -> Dict[int, float]:
+    # score = sum(count * 0.5 ^ (경과 시간 / 반감기)), 경과 시간은 버킷 끝 기준
+    scores: Dict[int, float] = {}
+    for dronespot_id, bucket, count in rows:
+        age_hours = max((now - bucket).total_seconds() / 3600 - 1, 0.0)
+        scores[dronespot_id] = scores.get(dronespot_id, 0.0) + count * 0.5 ** (age_hours / half_life_hours)
+    return scores
+
+
+class TrendingSnapshot:
+    # 감쇠 점수 순으로 정렬된 드론스팟 id 를 들고 있다가 페이지 단위로 잘라준다
+    def __init__(self):
+        self.ready = False
+        self._ids = array('q')
+
+    def replace(self, scores: Dict[int, float]) -> None:
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        self._ids = array('q', (dronespot_id for dronespot_id, _ in ranked))
+        self.ready = True
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def page(self, start: int, end: int) -> List[int]:
+        return self._ids[start:end].tolist()
+
+
+async def rebuild_trending_snapshot(db: AsyncSession, window_hours: int, half_life_hours: float) -> int:
+    # 윈도우를 벗어난 버킷은 지우고, 남은 버킷으로 점수를 다시 계산
+    now = datetime.utcnow()
+    cutoff = hour_bucket(now) - timedelta(hours=window_hours)
+    await db.execute(delete(TrendDronespotHourly).where(TrendDronespotHourly.bucket < cutoff))
+    await db.commit()
+
+    rows = (await db.execute(select(
+        TrendDronespotHourly.dronespot_id,
+        TrendDronespotHourly.bucket,
+        TrendDronespotHourly.count
+    ))).all()
+    trending_snapshot.replace(decayed_scores(rows, now, half_life_hours))
+    return trending_snapshot.count()
+
+
+trend_counter = TrendCounter()
+trending_snapshot = TrendingSnapshot()
@@ -0,0 +1,95 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Dronespot, UserDronespotLike, Review, UserReviewLike
+
+
+async def get_dronespot_aggregates(
+        db: AsyncSession,
+        dronespot_ids: List[int],
+        user_uid: Optional[str] = None,
+        user_db: Optional[AsyncSession] = None
+) -> Dict[int, Dict[str, int]]:
+    # 드론스팟 목록의 likes_count / reviews_count / is_like 를 한번에 조회
+    # db 가 레플리카여도 본인이 방금 누른 좋아요는 보이도록 is_like 는 user_db(primary) 에서
+    aggregates = {
+        dronespot_id: {"likes_count": 0, "reviews_count": 0, "is_like": 0}
+        for dronespot_id in dronespot_ids
+    }
+    if not aggregates:
+        return aggregates
+
+    ids = list(aggregates.keys())
+
+    counts = await db.execute(select(
+        Dronespot.id,
+        Dronespot.likes_count,
+        Dronespot.reviews_count
+    ).where(Dronespot.id.in_(ids)))
+    for dronespot_id, likes_count, reviews_count in counts:
+        aggregates[dronespot_id]["likes_count"] = likes_count
+        aggregates[dronespot_id]["reviews_count"] = reviews_count
+
+    if user_uid is not None:
+        liked = await (user_db or db).scalars(select(UserDronespotLike.drone_spot_id).where(
+            UserDronespotLike.user_uid == user_uid,
+            UserDronespotLike.drone_spot_id.in_(ids)
+        ))
+        for dronespot_id in liked:
+            aggregates[dronespot_id]["is_like"] = 1
+
+    return aggregates
+
+
+async def _increase_count(db: AsyncSession, model, row_id: int, column, amount: int) -> None:
+    # 카운터 컬럼을 DB 에서 원자적으로 증감 (commit 은 호출한 쪽에서)
+    query = update(model).where(model.id == row_id)
+    if amount < 0:
+        query = query.where(column >= -amount)
+    await db.execute(query.values({column: column + amount}).execution_options(synchronize_session=False))
+
+
+async def increase_dronespot_likes_count(db: AsyncSession, dronespot_id: int, amount: int) -> None:
+    await _increase_count(db, Dronespot, dronespot_id, Dronespot.likes_count, amount)
+
+
+async def increase_dronespot_reviews_count(db: AsyncSession, dronespot_id: int, amount: int) -> None:
+    await _increase_count(db, Dronespot, dronespot_id, Dronespot.reviews_count, amount)
+
+
+async def increase_review_likes_count(db: AsyncSession, review_id: int, amount: int) -> None:
+    await _increase_count(db, Review, review_id, Review.likes_count, amount)
+
+
+async def reconcile_counters(db: AsyncSession) -> int:
+    # 실제 좋아요/리뷰 수와 어긋난 카운터 컬럼을 바로잡는다
+    dronespot_likes = select(func.count(UserDronespotLike.drone_spot_id)).where(
+        UserDronespotLike.drone_spot_id == Dronespot.id
+    ).scalar_subquery()
+    dronespot_reviews = select(func.count(Review.id)).where(
+        Review.dronespot_id == Dronespot.id
+    ).scalar_subquery()
+    review_likes = select(func.count(UserReviewLike.review_id)).where(
+        UserReviewLike.review_id == Review.id
+    ).scalar_subquery()
+
+    fixed = (await db.execute(
+        update(Dronespot).where(
+            (Dronespot.likes_count != dronespot_likes) | (Dronespot.reviews_count != dronespot_reviews)
+        ).values(
+            likes_count=dronespot_likes,
+            reviews_count=dronespot_reviews
+        ).execution_options(synchronize_session=False)
+    )).rowcount
+    fixed += (await db.execute(
+        update(Review).where(
+            Review.likes_count != review_likes
+        ).values(
+            likes_count=review_likes
+        ).execution_options(synchronize_session=False)
+    )).rowcount
+    await db.commit()
+
+    return fixed
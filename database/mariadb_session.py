@@ -1,11 +1,33 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
+from database.pool_stats import PoolStats, MeasuredQueuePool, MeasuredAsyncQueuePool
+from database.replica import ReplicaRouter, parse_replica_hosts
 
-engine = create_engine(settings.MARIADB_URL)
+pool_options = dict(
+    pool_size=settings.MARIADB_POOL_SIZE,
+    max_overflow=settings.MARIADB_MAX_OVERFLOW,
+    pool_timeout=settings.MARIADB_POOL_TIMEOUT,
+    pool_recycle=settings.MARIADB_POOL_RECYCLE,
+    pool_pre_ping=settings.MARIADB_POOL_PRE_PING,
+)
+
+engine = create_engine(settings.MARIADB_URL, poolclass=MeasuredQueuePool, **pool_options)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# async 엔드포인트에서 이벤트 루프를 막지 않도록 비동기 세션 사용
+async_engine = create_async_engine(settings.MARIADB_ASYNC_URL, poolclass=MeasuredAsyncQueuePool, **pool_options)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+pool_stats = PoolStats('sync', engine)
+async_pool_stats = PoolStats('async', async_engine.sync_engine)
+
+# 읽기 전용 조회는 레플리카로 (쓰기, 본인이 방금 쓴 데이터를 읽는 조회는 primary)
+replica_router = ReplicaRouter(parse_replica_hosts(settings.MARIADB_REPLICA_HOSTS), pool_options)
+
 Base = declarative_base()
 
 def get_db():
@@ -13,4 +35,43 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db():
+    replica = replica_router.pick()
+    if replica is not None:
+        db = replica.SessionLocal()
+        try:
+            # 죽은 레플리카를 바로 걸러내기 위해 레플리카는 미리 연결해본다
+            db.connection()
+        except OperationalError:
+            # 다음 헬스체크까지 빼고 이번 요청은 primary 로
+            replica.healthy = False
+            db.close()
+        else:
+            try:
+                yield db
+            finally:
+                db.close()
+            return
+
+    yield from get_db()
+
+async def get_async_read_db():
+    replica = replica_router.pick()
+    if replica is not None:
+        async with replica.AsyncSessionLocal() as db:
+            try:
+                await db.connection()
+            except OperationalError:
+                replica.healthy = False
+            else:
+                yield db
+                return
+
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,20 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@asynccontextmanager
+async def named_lock(engine: AsyncEngine, name: str) -> AsyncIterator[bool]:
+    # MariaDB GET_LOCK 으로 여러 워커 중 하나만 작업하도록 한다 (잡지 못하면 기다리지 않고 False)
+    # 락은 커넥션에 묶이므로 작업이 끝날 때까지 커넥션 하나를 쥐고 있는다
+    async with engine.connect() as conn:
+        acquired = bool(await conn.scalar(text("SELECT GET_LOCK(:name, 0)"), {"name": name}))
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.scalar(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+                await conn.commit()
@@ -0,0 +1,94 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+
+class PoolStats:
+    # 엔진 하나의 커넥션 풀 사용 현황 (워커 프로세스 단위로 집계)
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'checkin', self._on_checkin)
+        # MeasuredQueuePool 이면 풀에서 기다린 시간도 여기에 기록
+        engine.pool.stats = self
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+
+    @contextmanager
+    def measure_wait(self):
+        # 풀에서 커넥션을 받을 때까지 걸린 시간
+        start = time.perf_counter()
+        try:
+            yield
+        except PoolTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        with self._lock:
+            return {
+                'name': self.name,
+                'size': pool.size(),
+                'checked_in': pool.checkedin(),
+                'checked_out': pool.checkedout(),
+                # overflow() 는 풀이 다 차기 전까지 음수
+                'overflow': max(pool.overflow(), 0),
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+            }
+
+
+class _MeasuredPool:
+    # 세션이 실제로 커넥션을 꺼낼 때 풀에서 기다린 시간을 PoolStats 에 남긴다
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        if self.stats is None:
+            return super()._do_get()
+        with self.stats.measure_wait():
+            return super()._do_get()
+
+    def recreate(self):
+        # dispose() 로 풀이 다시 만들어져도 집계는 이어서
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class MeasuredQueuePool(_MeasuredPool, QueuePool):
+    pass
+
+
+class MeasuredAsyncQueuePool(_MeasuredPool, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,66 @@
+import itertools
+from typing import List, Optional, Dict, Any
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from core.config import settings
+from database.pool_stats import PoolStats, MeasuredQueuePool, MeasuredAsyncQueuePool
+
+
+def replica_url(host: str, driver: str) -> str:
+    return (f'mariadb+{driver}://{settings.MARIADB_USERNAME}:{settings.MARIADB_PASSWORD}@{host}'
+            f'/{settings.MARIADB_DATABASE}?charset=utf8mb4')
+
+
+class Replica:
+    # 레플리카 하나의 동기/비동기 엔진과 헬스 상태
+    def __init__(self, host: str, pool_options: Dict[str, Any]):
+        self.host = host
+        self.healthy = False
+
+        self.engine = create_engine(replica_url(host, 'pymysql'), poolclass=MeasuredQueuePool, **pool_options)
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.async_engine = create_async_engine(replica_url(host, 'aiomysql'), poolclass=MeasuredAsyncQueuePool, **pool_options)
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+
+        self.pool_stats = PoolStats(f'replica {host} sync', self.engine)
+        self.async_pool_stats = PoolStats(f'replica {host} async', self.async_engine.sync_engine)
+
+    async def check_health(self) -> bool:
+        try:
+            async with self.async_engine.connect() as conn:
+                await conn.execute(text('SELECT 1'))
+            self.healthy = True
+        except Exception as e:
+            print(f"replica {self.host} unhealthy: {e}")
+            self.healthy = False
+        return self.healthy
+
+
+class ReplicaRouter:
+    # 읽기 전용 세션을 정상 레플리카에 라운드로빈으로 배분
+    def __init__(self, hosts: List[str], pool_options: Dict[str, Any]):
+        self.replicas = [Replica(host, pool_options) for host in hosts]
+        self._counter = itertools.count()
+
+    def pick(self) -> Optional[Replica]:
+        # 정상인 레플리카가 없으면 None (호출한 쪽에서 primary 사용)
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def check_health(self) -> int:
+        healthy = 0
+        for replica in self.replicas:
+            if await replica.check_health():
+                healthy += 1
+        return healthy
+
+
+def parse_replica_hosts(hosts: str) -> List[str]:
+    return [host.strip() for host in hosts.split(',') if host.strip()]
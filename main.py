@@ -11,9 +11,20 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 
 from fastapi.staticfiles import StaticFiles
+from datetime import datetime, timezone
 
 from core.config import settings
+from core.http_client import start_http_client, close_http_client
 from core.scheduler.refresh_manager import delete_expired_refresh
+from core.scheduler.counter_manager import reconcile_count_columns
+from core.scheduler.index_manager import rebuild_dronespot_index
+from core.scheduler.whether_manager import prefetch_whether
+from core.scheduler.replica_manager import check_replicas
+from database.mariadb_session import replica_router
+from core.scheduler.sampler_manager import rebuild_samplers
+from core.scheduler.recommend_manager import rebuild_recommendations
+from core.scheduler.enrichment_manager import run_enrichment_jobs
+from core.scheduler.trend_manager import flush_trend_counter, rebuild_trending
 
 app = FastAPI()
 scheduler = AsyncIOScheduler()
@@ -21,14 +32,42 @@ scheduler = AsyncIOScheduler()
 @app.on_event("startup")
 async def startup_event():
     print('startup')
+    # 외부 API 호출에 함께 쓰는 httpx 클라이언트 (keep-alive 커넥션 재사용)
+    await start_http_client()
+    await rebuild_dronespot_index()
+    await rebuild_samplers()
+    # 레플리카가 설정된 경우 헬스체크 후 읽기 조회를 분산
+    if replica_router.replicas:
+        await check_replicas()
+        scheduler.add_job(check_replicas, IntervalTrigger(seconds=settings.MARIADB_REPLICA_HEALTH_CHECK_SECONDS))
     # scheduler.add_job(task, CronTrigger(hour=12, minute=26, timezone='Asia/Seoul'))
     scheduler.add_job(delete_expired_refresh, IntervalTrigger(hours=1, timezone='Asia/Seoul'))
+    scheduler.add_job(reconcile_count_columns, CronTrigger(hour=4, minute=0, timezone='Asia/Seoul'))
+    # 다른 워커에서 생성/수정된 드론스팟 반영
+    scheduler.add_job(rebuild_dronespot_index, IntervalTrigger(minutes=10, timezone='Asia/Seoul'))
+    scheduler.add_job(rebuild_samplers, IntervalTrigger(minutes=10, timezone='Asia/Seoul'))
+    # 드론스팟 생성/위치 수정 시 쌓인 주변장소 저장 작업 처리
+    scheduler.add_job(run_enrichment_jobs, IntervalTrigger(seconds=settings.ENRICHMENT_POLL_SECONDS))
+    # 검색 트렌드 카운트는 메모리에 모았다가 몇 초마다 한번에 반영
+    scheduler.add_job(flush_trend_counter, IntervalTrigger(seconds=settings.TREND_FLUSH_SECONDS))
+    # 최근 검색 버킷으로 감쇠 점수를 다시 계산해 인기 순위 스냅샷 교체
+    scheduler.add_job(rebuild_trending, IntervalTrigger(minutes=settings.TRENDING_REFRESH_MINUTES),
+                      next_run_time=datetime.now(tz=timezone.utc))
+    # 개인화 추천 목록은 시작 직후 한 번, 이후 매시간 다시 계산 (기동을 막지 않도록 잡으로 실행)
+    scheduler.add_job(rebuild_recommendations, IntervalTrigger(hours=1, timezone='Asia/Seoul'),
+                      next_run_time=datetime.now(tz=timezone.utc))
+    # 기상청 발표(02:15, 05:15, ... 23:15) 직후 모든 격자의 예보를 미리 받아둔다
+    scheduler.add_job(prefetch_whether, CronTrigger(hour='2,5,8,11,14,17,20,23', minute=20, timezone='Asia/Seoul'),
+                      next_run_time=datetime.now(tz=timezone.utc))
     scheduler.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     print('shudown')
     scheduler.shutdown()
+    # 아직 반영되지 않은 트렌드 카운트
+    await flush_trend_counter()
+    await close_http_client()
 
 app.mount("/media", StaticFiles(directory=settings.MEDIA_DIR), name="media")
 
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Column, String, Integer, String, DateTime, Boolean, ForeignKey, Text, PrimaryKeyConstraint
+from sqlalchemy import Column, String, Integer, String, DateTime, Boolean, ForeignKey, Text, PrimaryKeyConstraint, Index
 from sqlalchemy.dialects.mysql import INTEGER, LONGTEXT, DATE, DATETIME, TINYINT, TEXT, DOUBLE
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -92,26 +92,51 @@ class Dronespot(Base):
     permit_flight = Column(TINYINT(1), nullable=False)
     permit_camera = Column(TINYINT(1), nullable=False)
     drone_type = Column(TINYINT(1), nullable=False)
+    likes_count = Column(INTEGER(unsigned=True), nullable=False, default=0, server_default='0', index=True)
+    reviews_count = Column(INTEGER(unsigned=True), nullable=False, default=0, server_default='0')
 
     user_dronespot_likes = relationship('UserDronespotLike', back_populates='dronespot')
     reviews = relationship('Review', back_populates='dronespot')
     course_visits = relationship('CourseVisit', back_populates='dronespot')
     drone_places = relationship('DronePlace', back_populates='dronespot')
     trend_dronespots = relationship('TrendDronespot', back_populates='dronespot')
-    whether = relationship('Whether', back_populates='dronespot', cascade="all, delete-orphan")
+    dronespot_areas = relationship('DronespotArea', back_populates='dronespot', cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ix_dronespot_lat_lon', 'lat', 'lon'),
+    )
 
-class Whether(Base):
-    __tablename__ = 'whether'
+
+class Area(Base):
+    __tablename__ = 'area'
+
+    id = Column(INTEGER(unsigned=True), primary_key=True, nullable=False, autoincrement=False)
+    name = Column(String(45), nullable=False)
+
+    dronespot_areas = relationship('DronespotArea', back_populates='area')
+
+
+class DronespotArea(Base):
+    __tablename__ = 'dronespot_area'
 
     dronespot_id = Column(INTEGER(unsigned=True), ForeignKey('dronespot.id'), primary_key=True, nullable=False)
-    created_at = Column(DATETIME, nullable=False)
+    area_id = Column(INTEGER(unsigned=True), ForeignKey('area.id'), primary_key=True, nullable=False)
+
+    dronespot = relationship('Dronespot', back_populates='dronespot_areas')
+    area = relationship('Area', back_populates='dronespot_areas')
+
+
+class Whether(Base):
+    __tablename__ = 'whether_grid'
+
+    # 기상청 동네예보 격자 좌표와 발표 시각
+    nx = Column(INTEGER(), primary_key=True, nullable=False)
+    ny = Column(INTEGER(), primary_key=True, nullable=False)
+    base_time = Column(DATETIME, primary_key=True, nullable=False)
     sky = Column(INTEGER(), nullable=False)
     pty = Column(INTEGER(), nullable=False)
     degree = Column(INTEGER(), nullable=False)
 
-    dronespot = relationship('Dronespot', back_populates='whether')
-
 class UserDronespotLike(Base):
     __tablename__ = 'user_dronespot_like'
 
@@ -122,6 +147,10 @@ class UserDronespotLike(Base):
     user = relationship('User', back_populates='user_dronespot_likes')
     dronespot = relationship('Dronespot', back_populates='user_dronespot_likes')
 
+    __table_args__ = (
+        Index('ix_user_dronespot_like_user_created', 'user_uid', 'created_at'),
+    )
+
 class TrendDronespot(Base):
     __tablename__ = 'trend_dronespot'
 
@@ -131,6 +160,19 @@ class TrendDronespot(Base):
     dronespot = relationship('Dronespot',back_populates='trend_dronespots')
 
 
+class TrendDronespotHourly(Base):
+    # 시간 단위로 나눈 검색 횟수 (최근 구간만 유지하며 감쇠 점수 계산에 사용)
+    __tablename__ = 'trend_dronespot_hourly'
+
+    dronespot_id = Column(INTEGER(unsigned=True), ForeignKey('dronespot.id', ondelete="CASCADE"), primary_key=True, nullable=False)
+    bucket = Column(DATETIME, primary_key=True, nullable=False)
+    count = Column(INTEGER(unsigned=True), nullable=False)
+
+    __table_args__ = (
+        Index('ix_trend_dronespot_hourly_bucket', 'bucket'),
+    )
+
+
 class Review(Base):
     __tablename__ = 'review'
 
@@ -145,12 +187,18 @@ class Review(Base):
     comment = Column(Text, nullable=True)
     photo_url = Column(Text, nullable=True)
     is_reported = Column(TINYINT(1), nullable=False, default=0)
+    likes_count = Column(INTEGER(unsigned=True), nullable=False, default=0, server_default='0')
 
     user = relationship('User', back_populates='reviews')
     dronespot = relationship('Dronespot', back_populates='reviews')
     user_review_likes = relationship('UserReviewLike', back_populates='review', cascade="all, delete-orphan")
     review_report = relationship('ReviewReport', back_populates='reviews')
 
+    __table_args__ = (
+        Index('ix_review_writer_flight_date', 'writer_uid', 'flight_date', 'id'),
+        Index('ix_review_dronespot_likes', 'dronespot_id', 'likes_count', 'id'),
+    )
+
 class ReviewReport(Base):
     __tablename__ = "review_report"
 
@@ -172,6 +220,10 @@ class UserReviewLike(Base):
     user = relationship('User', back_populates='user_review_likes')
     review = relationship('Review', back_populates='user_review_likes')
 
+    __table_args__ = (
+        Index('ix_user_review_like_user_created', 'user_uid', 'created_at'),
+    )
+
 class Place(Base):
     __tablename__ = 'place'
 
@@ -189,6 +241,11 @@ class Place(Base):
     course_visits = relationship('CourseVisit', back_populates='place')
     drone_places = relationship('DronePlace', back_populates='place')
 
+    __table_args__ = (
+        # TourAPI contentid
+        Index('ux_place_type', 'type', unique=True),
+    )
+
 class DronePlace(Base):
     __tablename__ = 'drone_place'
 
@@ -199,6 +256,28 @@ class DronePlace(Base):
     dronespot = relationship('Dronespot', back_populates='drone_places')
     place = relationship('Place', back_populates='drone_places')
 
+    __table_args__ = (
+        Index('ux_drone_place_dronespot_place', 'dronespot_id', 'place_id', unique=True),
+    )
+
+class EnrichmentJob(Base):
+    # 드론스팟 주변장소(TourAPI) 저장 작업 큐
+    __tablename__ = 'enrichment_job'
+
+    id = Column(INTEGER(unsigned=True), primary_key=True, nullable=False, autoincrement=True)
+    dronespot_id = Column(INTEGER(unsigned=True), ForeignKey('dronespot.id', ondelete="CASCADE"), nullable=False)
+    status = Column(String(16), nullable=False, default='pending')  # pending, running, done, failed
+    attempts = Column(INTEGER(unsigned=True), nullable=False, default=0)
+    next_run_at = Column(DATETIME, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DATETIME, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('ix_enrichment_job_status_next_run', 'status', 'next_run_at'),
+        Index('ix_enrichment_job_dronespot', 'dronespot_id', 'id'),
+    )
+
 class PlaceType(Base):
     __tablename__ = 'place_type'
 
@@ -150,6 +150,23 @@ class Dronespot(DronespotBase):
     class Config:
         from_attributes = True
 
+class DronespotAutocomplete(BaseModel):
+    id: int
+    name: str
+
+class EnrichmentJob(BaseModel):
+    id: int
+    dronespot_id: int
+    status: str
+    attempts: int
+    next_run_at: datetime
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
 
 # UserDronespotLike pydantic 스키마
 class UserDronespotLikeBase(BaseModel):
@@ -0,0 +1,9 @@
+import os
+
+# Settings 필수 값 (테스트는 실제 DB/외부 API 에 붙지 않는다)
+for name in ('MARIADB_HOST', 'MARIADB_USERNAME', 'MARIADB_PASSWORD', 'MARIADB_DATABASE', 'ACCESS_SECRET_KEY',
+             'REFRESH_SECRET_KEY', 'PASSWORD_SALT', 'TOURAPI_LDM_KEY', 'WHETHER_API_KEY'):
+    os.environ.setdefault(name, 'test')
+os.environ.setdefault('MARIADB_PORT', '3306')
+os.environ.setdefault('ACCESS_TOKEN_ENCODE_ALGORITHM', 'HS256')
+os.environ.setdefault('REFRESH_TOKEN_ENCODE_ALGORITHM', 'HS256')
@@ -0,0 +1,98 @@
+import asyncio
+
+from sqlalchemy.dialects.mysql import TINYINT
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+
+import core.enrichment as enrichment
+from core.enrichment import enqueue_enrichment, claim_enrichment_jobs, run_enrichment_job, PENDING, RUNNING, DONE
+from database.mariadb_session import Base
+from models import Dronespot, EnrichmentJob
+
+
+@compiles(TINYINT, 'sqlite')
+def _compile_tinyint(type_, compiler, **kw):
+    return 'INTEGER'
+
+
+async def make_session(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path}/enrichment.db')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Dronespot.__table__, EnrichmentJob.__table__])
+    return engine, async_sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+def test_move_during_running_job_queues_a_fresh_job(tmp_path, monkeypatch):
+    async def scenario():
+        engine, Session = await make_session(tmp_path)
+        seen_lats = []
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def fake_save_place(spot_id):
+            # 실행 중인 작업이 드론스팟 위치를 읽은 뒤 TourAPI 를 기다리는 상태를 흉내낸다
+            async with Session() as db:
+                seen_lats.append(float((await db.get(Dronespot, spot_id)).lat))
+            started.set()
+            await release.wait()
+
+        monkeypatch.setattr(enrichment, 'save_place', fake_save_place)
+
+        async with Session() as db:
+            spot = Dronespot(name='spot', lat=37.0, lon=127.0, address='addr', comment='', permit_flight=1,
+                             permit_camera=1, drone_type=0, likes_count=0, reviews_count=0)
+            db.add(spot)
+            await db.commit()
+            first = await enqueue_enrichment(db, spot.id)
+        async with Session() as db:
+            assert await claim_enrichment_jobs(db, 10) == [first.id]
+
+        async def run(job_id):
+            async with Session() as db:
+                await run_enrichment_job(db, job_id)
+
+        running = asyncio.ensure_future(run(first.id))
+        await started.wait()
+
+        # 실행 중에 위치가 바뀌면 새 작업이 들어가야 한다
+        async with Session() as db:
+            (await db.get(Dronespot, spot.id)).lat = 36.0
+            await db.commit()
+            second = await enqueue_enrichment(db, spot.id)
+        assert second.id != first.id
+        assert second.status == PENDING
+
+        # 같은 드론스팟의 이전 작업이 끝나기 전에는 새 작업을 가져가지 않는다
+        async with Session() as db:
+            assert await claim_enrichment_jobs(db, 10) == []
+            assert (await db.get(EnrichmentJob, first.id)).status == RUNNING
+
+        release.set()
+        await running
+        async with Session() as db:
+            assert await claim_enrichment_jobs(db, 10) == [second.id]
+        await run(second.id)
+
+        async with Session() as db:
+            assert (await db.get(EnrichmentJob, first.id)).status == DONE
+            assert (await db.get(EnrichmentJob, second.id)).status == DONE
+        assert seen_lats == [37.0, 36.0]
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_enqueue_reuses_a_pending_job(tmp_path):
+    async def scenario():
+        engine, Session = await make_session(tmp_path)
+        async with Session() as db:
+            spot = Dronespot(name='spot', lat=37.0, lon=127.0, address='addr', comment='', permit_flight=1,
+                             permit_camera=1, drone_type=0, likes_count=0, reviews_count=0)
+            db.add(spot)
+            await db.commit()
+            first = await enqueue_enrichment(db, spot.id)
+            second = await enqueue_enrichment(db, spot.id)
+        assert first.id == second.id
+        await engine.dispose()
+
+    asyncio.run(scenario())
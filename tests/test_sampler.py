@@ -0,0 +1,59 @@
+from core.sampler import RandomSampler
+
+DRONESPOT = 'dronespot'
+
+
+def make_sampler(ids):
+    sampler = RandomSampler()
+    sampler.build([(DRONESPOT, row_id) for row_id in ids])
+    return sampler
+
+
+def pages(sampler, seed, size, count):
+    return [sampler.permuted(DRONESPOT, i * size, (i + 1) * size, seed) for i in range(count)]
+
+
+def test_same_seed_pages_through_every_id_once():
+    sampler = make_sampler(range(1, 101))
+    ids = [row_id for page in pages(sampler, 42, 10, 10) for row_id in page]
+
+    assert sorted(ids) == list(range(1, 101))
+    assert pages(sampler, 42, 10, 10) == pages(make_sampler(range(100, 0, -1)), 42, 10, 10)
+    assert ids != [row_id for page in pages(sampler, 43, 10, 10) for row_id in page]
+
+
+def test_seeded_order_is_not_insertion_order():
+    # 연속된 id 가 같은 간격으로 붙어 나오지 않는다
+    ids = [row_id for page in pages(make_sampler(range(1, 1001)), 7, 100, 10) for row_id in page]
+    steps = {b - a for a, b in zip(ids, ids[1:])}
+    assert len(steps) > 100
+
+
+def test_id_changes_keep_the_order_of_other_ids():
+    sampler = make_sampler(range(1, 101))
+    before = sampler.permuted(DRONESPOT, 0, 100, 42)
+
+    sampler.add(DRONESPOT, 500)
+    sampler.remove(DRONESPOT, before[50])
+    after = sampler.permuted(DRONESPOT, 0, 100, 42)
+
+    assert [row_id for row_id in after if row_id != 500] == [row_id for row_id in before if row_id != before[50]]
+
+
+def test_seed_is_stable_only_up_to_the_changed_ids():
+    # 페이지를 넘기는 사이 id 가 하나 추가되면 이후 페이지는 최대 한 칸 밀린다 (중복 하나)
+    sampler = make_sampler(range(1, 101))
+    first = sampler.permuted(DRONESPOT, 0, 10, 42)
+    sampler.add(DRONESPOT, 500)
+    second = sampler.permuted(DRONESPOT, 10, 20, 42)
+
+    assert len(set(first) & set(second)) <= 1
+    assert len(set(first) | set(second)) >= 19
+
+
+def test_sample_without_seed_and_out_of_range_pages():
+    sampler = make_sampler(range(1, 11))
+
+    assert len(set(sampler.sample(DRONESPOT, 5))) == 5
+    assert sampler.sample(DRONESPOT, 5, page_num=3, seed=1) == []
+    assert sampler.sample('missing', 5, seed=1) == []